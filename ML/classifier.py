@@ -5,18 +5,46 @@ import numpy as np
 import sys
 from sklearn.preprocessing import StandardScaler
 
+from predict_kernel import predict_rows as _predict_rows_py
+
+# 예측 커널 선택: AOT 빌드 모듈(ml_aot_build.py) > Numba JIT > NumPy 경로
+try:
+    from ml_aot import predict_rows_f32 as predict_rows
+except ImportError:
+    try:
+        from numba import njit
+        predict_rows = njit(cache=True, fastmath=True)(_predict_rows_py)
+    except ImportError:  # numba가 없으면 NumPy 경로로 예측
+        predict_rows = None
+
+# Cython FSR 패킷 파서 (cythonize -i parse_fsr.pyx로 빌드, 없으면 NumPy 파싱)
+try:
+    from parse_fsr import parse as parse_fsr_packet
+except ImportError:
+    parse_fsr_packet = None
+
 # ★★★ 환경 설정 ★★★
 SERIAL_PORT = 'COM5'
 BAUD_RATE = 9600
 MODEL_FILENAME = 'models/model_lr.joblib'
 SCALER_FILENAME = 'models/scaler.joblib'
+BATCH_SIZE = 4  # 한 번에 예측할 샘플 수 (sklearn 호출 오버헤드 분산)
+SERIAL_RX_BUFFER = 65536  # 드라이버 수신 버퍼 크기 (Windows 전용 설정)
+MAX_FRAME_BYTES = 2048    # 한 프레임(한 줄)의 최대 길이
+QUANTIZE_INT8 = False  # 컴파일된 커널이 없을 때 int8 양자화 가중치로 예측 (명시적으로 켤 때만 사용)
+QUANT_X_RANGE = 4.0   # 표준화 입력의 양자화 범위 (±4σ 밖은 클리핑)
+QUANT_CHECK_SAMPLES = 2000  # int8 예측을 켜기 전 float32 예측과 비교할 표본 수
+QUANT_MIN_AGREEMENT = 0.99  # int8 예측을 사용하기 위한 최소 argmax 일치율
 # CALIBRATION_DATA_COUNT = 30 # 보정 데이터 개수 설정 (10개)
 
 def setup_serial_connection(port, baudrate):
     """시리얼 포트를 열고 아두이노와의 연결을 설정합니다."""
     print("아두이노와 시리얼 연결 시도...")
     try:
-        ser = serial.Serial(port, baudrate, timeout=1)
+        ser = serial.Serial(port, baudrate, timeout=0.05)
+        if hasattr(ser, 'set_buffer_size'):
+            # Windows에서만 지원: 수신 버퍼를 키워 처리 지연 중 프레임 유실 방지
+            ser.set_buffer_size(rx_size=SERIAL_RX_BUFFER)
         time.sleep(2)  # 아두이노 리셋 대기
         print(f"✅ 연결 성공: {port} @ {baudrate} bps")
         return ser
@@ -25,6 +53,102 @@ def setup_serial_connection(port, baudrate):
         print("1) 장치 연결 확인 2) 포트 이름 확인 3) 다른 프로그램이 포트 사용 중인지 확인")
         return None
 
+def read_frames(ser):
+    """한 프레임을 기다린 뒤, 이미 버퍼에 쌓인 프레임을 대기 없이 모두 꺼내 반환합니다."""
+    # read_until()은 줄바꿈, 최대 길이 또는 타임아웃까지 블로킹되므로 별도 폴링/대기가 필요 없음
+    frames = [ser.read_until(b'\n', MAX_FRAME_BYTES)]
+    while ser.in_waiting:
+        frames.append(ser.read_until(b'\n', MAX_FRAME_BYTES))
+    return frames
+
+def build_linear_predictor(model):
+    """선형 모델의 가중치를 float32로 캐시하여 sklearn 검증 경로 없이 예측하는 함수를 반환합니다."""
+    if not hasattr(model, 'coef_') or not hasattr(model, 'intercept_'):
+        return model.predict
+
+    W = model.coef_.astype(np.float32).T.copy()  # (n_features, n_classes)
+    b = model.intercept_.astype(np.float32)
+    classes = model.classes_
+
+    if W.shape[1] == 1:
+        # 이진 분류: 결정 함수의 부호로 클래스 선택
+        w0 = W[:, 0].copy()
+        b0 = b[0]
+
+        def predict(X):
+            return classes[(X @ w0 + b0 > 0).astype(np.intp)]
+    else:
+        def predict(X):
+            scores = X @ W
+            scores += b
+            return classes[scores.argmax(axis=1)]
+
+    return predict
+
+def linear_params_f32(model):
+    """선형 모델 가중치를 (n_features, n_classes) float32로 반환 (이진 분류는 0 열을 추가해 argmax로 통일)"""
+    W = model.coef_.astype(np.float32).T
+    b = model.intercept_.astype(np.float32)
+    if W.shape[1] == 1:
+        W = np.hstack([np.zeros_like(W), W])
+        b = np.concatenate([np.zeros(1, dtype=np.float32), b])
+    return np.ascontiguousarray(W), np.ascontiguousarray(b)
+
+def build_int8_predictor(model):
+    """선형 모델 가중치를 열별 스케일로 int8 양자화하여 정수 행렬곱으로 예측하는 함수를 반환 (사용 불가 시 None)"""
+    if not hasattr(model, 'coef_'):
+        return None
+
+    W, b = linear_params_f32(model)
+    classes = model.classes_
+
+    # 1회 보정: 가중치는 열(클래스)별 최대 절댓값, 입력은 표준화 범위 기준으로 스케일 결정
+    scale_w = np.abs(W).max(axis=0) / 127.0
+    scale_w[scale_w == 0] = 1.0
+    Wq = np.round(W / scale_w).astype(np.int8)
+    scale_x = np.float32(QUANT_X_RANGE / 127.0)
+    inv_scale_x = np.float32(1.0) / scale_x
+    # NumPy에는 int8→int32 누적 행렬곱이 없으므로 int32로 한 번만 확장해 둠
+    Wq_i32 = Wq.astype(np.int32)
+    out_scale = (scale_x * scale_w).astype(np.float32)
+
+    def predict(X):
+        """표준화된 X를 int8로 양자화한 뒤 int32 누적 점수로 예측 클래스를 반환"""
+        Xq = np.rint(X * inv_scale_x)
+        np.clip(Xq, -127, 127, out=Xq)
+        scores = (Xq.astype(np.int8).astype(np.int32) @ Wq_i32) * out_scale
+        scores += b
+        return classes[scores.argmax(axis=1)]
+
+    return predict
+
+def int8_agreement(float_predict, int8_predict, n_features, n_samples=QUANT_CHECK_SAMPLES):
+    """표준화 입력 표본(고정 시드 표준정규분포)에서 int8 예측이 float32 예측과 일치하는 비율을 반환"""
+    X = np.random.default_rng(0).standard_normal((n_samples, n_features)).astype(np.float32)
+    return float(np.mean(int8_predict(X) == float_predict(X)))
+
+def build_fused_predictor(model, mean, inv_std):
+    """표준화+예측을 하나의 컴파일된 커널로 수행하는 함수를 반환 (사용 불가 시 None)"""
+    if predict_rows is None or not hasattr(model, 'coef_'):
+        return None
+
+    W, b = linear_params_f32(model)
+    classes = model.classes_
+    mean = np.ascontiguousarray(mean, dtype=np.float32)
+    inv_std = np.ascontiguousarray(inv_std, dtype=np.float32)
+
+    # JIT 사용 시 첫 호출 컴파일 비용을 시작 시점에 미리 지불 (cache=True로 이후 실행은 디스크 캐시 사용)
+    predict_rows(np.zeros((1, W.shape[0]), dtype=np.float32), mean, inv_std, W, b,
+                 np.empty(1, dtype=np.int64))
+
+    def predict(X):
+        """X를 표준화된 값으로 덮어쓰고 예측 클래스를 반환"""
+        out = np.empty(X.shape[0], dtype=np.int64)
+        predict_rows(X, mean, inv_std, W, b, out)
+        return classes[out]
+
+    return predict
+
 def main():
     print("start")
     ser = setup_serial_connection(SERIAL_PORT, BAUD_RATE)
@@ -32,6 +156,16 @@ def main():
         return
     
     model = joblib.load(MODEL_FILENAME)
+    predict = build_linear_predictor(model)
+    if QUANTIZE_INT8:
+        int8_predict = build_int8_predictor(model)
+        if int8_predict is not None:
+            # argmax가 float32 예측과 충분히 일치할 때만 int8 예측으로 교체
+            agreement = int8_agreement(predict, int8_predict, model.coef_.shape[1])
+            if agreement >= QUANT_MIN_AGREEMENT:
+                predict = int8_predict
+            else:
+                print(f"경고: int8 예측 일치율 {agreement:.3f} < {QUANT_MIN_AGREEMENT} - float32 예측을 사용합니다.")
   
 
     # ★★★ 표준화를 위한 변수 및 단계 초기화
@@ -42,8 +176,20 @@ def main():
     ss=joblib.load(SCALER_FILENAME)
     scaler_mean=ss.mean_
     scaler_std=ss.scale_
+    # 나눗셈 대신 곱셈을 쓰도록 표준화 상수를 미리 계산
+    mean_f32 = scaler_mean.astype(np.float32)
+    inv_std_f32 = (1.0 / scaler_std).astype(np.float32)
     data_counter = 0 # 5번째 데이터마다 처리하기 위한 카운터
 
+    # 예측 대상 샘플을 모아 두는 배치 버퍼
+    n_features = len(scaler_mean)
+    sample_buf = np.empty(n_features, dtype=np.float32)
+    batch_buf = np.empty((BATCH_SIZE, n_features), dtype=np.float32)
+    batch_lines = [None] * BATCH_SIZE
+    batch_counters = [0] * BATCH_SIZE
+    batch_idx = 0
+    fused_predict = build_fused_predictor(model, mean_f32, inv_std_f32)
+
     print("\n데이터 수신을 시작합니다. 중지하려면 'Ctrl+C'를 누르세요.")
     print(f"scaler 평균: {scaler_mean}")
     print(f"scaler 표준편차: {scaler_std}")
@@ -51,71 +197,82 @@ def main():
     
     try:
         while True:
-            if ser.in_waiting > 0:
-                try:
-                    raw = ser.readline()
-                    if not raw:
-                        continue
-                    line = raw.decode('utf-8', errors='replace').strip()
-                except Exception as e:
-                    print(f"경고: 시리얼 디코딩 오류 - {e}")
-                    continue
+            try:
+                frames = read_frames(ser)
+            except Exception as e:
+                print(f"경고: 시리얼 읽기 오류 - {e}")
+                continue
 
-                if line:
-                    try:
-                        # 쉼표로 분리하여 숫자형 리스트로 변환
-                        parts = [float(p) for p in line.split(',') if p.strip()]
-                        
-                        # # ★★★ 보정(Calibration) 단계 실행
-                        # if is_calibrating:
-                        #     calibration_data.append(parts)
-                        #     print(f"보정 데이터 수집 중... ({len(calibration_data)}/{CALIBRATION_DATA_COUNT})")
-                            
-                        #     # 보정 데이터 개수가 10개에 도달했는지 확인
-                        #     if len(calibration_data) >= CALIBRATION_DATA_COUNT:
-                        #         calibration_data_np = np.array(calibration_data)
-                        #         calibration_mean = np.mean(calibration_data_np, axis=0)
-                        #         calibration_std = np.std(calibration_data_np, axis=0)
-                        #         # 표준편차가 0인 경우를 방지 (0으로 나누기 오류)
-                        #         calibration_std[calibration_std == 0] = 1e-9
-                                
-                        #         is_calibrating = False
-                        #         print("\n✅ 보정 완료! 이후 모든 데이터는 표준화되어 예측에 사용됩니다.")
-                        #         print(f"**보정 기준 (평균/표준편차):**")
-                        #         print(f"평균: {calibration_mean}")
-                        #         print(f"표준편차: {calibration_std}")
-
-                        # ★★★ 실시간 예측 단계
-                        # else:
-                        data_counter += 1
+            for raw in frames:
+                if len(raw) < 3:
+                    continue  # 타임아웃 또는 줄바꿈만 수신된 경우
+
+                try:
+                    if parse_fsr_packet is not None:
+                        # 디코딩 없이 bytes를 바로 float32 버퍼로 파싱
+                        count = parse_fsr_packet(raw, sample_buf)
+                        parts = sample_buf
+                    else:
+                        # 쉼표 구분 ASCII bytes를 C 레벨에서 바로 float32 배열로 변환 (줄바꿈은 무시됨)
+                        parts = np.fromstring(raw, sep=',', dtype=np.float32)
+                        count = parts.size
+                    if count != n_features:
+                        raise ValueError(f"센서 값 개수 불일치: {count}")
+                
+                    # # ★★★ 보정(Calibration) 단계 실행
+                    # if is_calibrating:
+                    #     calibration_data.append(parts)
+                    #     print(f"보정 데이터 수집 중... ({len(calibration_data)}/{CALIBRATION_DATA_COUNT})")
+                    
+                    #     # 보정 데이터 개수가 10개에 도달했는지 확인
+                    #     if len(calibration_data) >= CALIBRATION_DATA_COUNT:
+                    #         calibration_data_np = np.array(calibration_data)
+                    #         calibration_mean = np.mean(calibration_data_np, axis=0)
+                    #         calibration_std = np.std(calibration_data_np, axis=0)
+                    #         # 표준편차가 0인 경우를 방지 (0으로 나누기 오류)
+                    #         calibration_std[calibration_std == 0] = 1e-9
                         
-                        # 5번째 데이터마다 예측을 수행
-                        if data_counter % 5 == 0:
-                            # 1. 수신 데이터를 NumPy 배열로 변환
-                            data_to_predict = np.array(parts).reshape(1, -1)
-                            
-                            # 2. 데이터를 보정 기준(평균, 표준편차)으로 표준화
-                            standardized_data = (data_to_predict - scaler_mean) / scaler_std
-                            
-                            # 3. 모델 예측 수행
-                            prediction = model.predict(standardized_data)
-                            # prediction = model.predict(data_to_predict)
-                            
+                    #         is_calibrating = False
+                    #         print("\n✅ 보정 완료! 이후 모든 데이터는 표준화되어 예측에 사용됩니다.")
+                    #         print(f"**보정 기준 (평균/표준편차):**")
+                    #         print(f"평균: {calibration_mean}")
+                    #         print(f"표준편차: {calibration_std}")
+
+                    # ★★★ 실시간 예측 단계
+                    # else:
+                    data_counter += 1
+                
+                    # 5번째 데이터마다 배치 버퍼에 적재
+                    if data_counter % 5 == 0:
+                        # 1. 수신 데이터를 배치 버퍼에 기록
+                        np.copyto(batch_buf[batch_idx], parts)
+                        batch_lines[batch_idx] = raw
+                        batch_counters[batch_idx] = data_counter
+                        batch_idx += 1
+
+                        if batch_idx == BATCH_SIZE:
+                            if fused_predict is not None:
+                                # 2-3. 표준화(in-place)와 예측을 컴파일된 커널에서 한 번에 수행
+                                predictions = fused_predict(batch_buf)
+                            else:
+                                # 2. 배치 전체를 한 번에 표준화 (in-place)
+                                np.subtract(batch_buf, mean_f32, out=batch_buf)
+                                np.multiply(batch_buf, inv_std_f32, out=batch_buf)
+
+                                # 3. 배치 단위 모델 예측 수행
+                                predictions = predict(batch_buf)
+
                             # 4. 예측 결과와 함께 데이터 출력
-                            print(f"({data_counter}번째 데이터) 수신 데이터: {line}| 예측 결과: {prediction}")
-                            print(f"({data_counter}번째 데이터) 수신 데이터: {standardized_data} | 예측 결과: {prediction}")
-                            print("\n")
-                            # formatted_data = [f"{x:.4f}" for x in standardized_data[0]] # standardized_data는 2차원 배열이므로 [0]으로 접근
-                            # # formatted_data_str = ", ".join(formatted_data)
-                            # print(f"({data_counter}번째 데이터) 수신 데이터: {formatted_data} | 예측 결과: {prediction}")
-                            
-                    except ValueError:
-                        print(f"경고: 올바른 형식의 데이터가 아닙니다 - {line}")
-                    except Exception as e:
-                        print(f"경고: 처리 중 오류 발생 - {e}")
-            
-            # CPU 사용량 최소화를 위해 잠시 대기
-            time.sleep(0.01)
+                            for i in range(BATCH_SIZE):
+                                print(f"({batch_counters[i]}번째 데이터) 수신 데이터: {batch_lines[i].decode('ascii', errors='replace').strip()}| 예측 결과: {predictions[i]}")
+                                print(f"({batch_counters[i]}번째 데이터) 수신 데이터: {batch_buf[i]} | 예측 결과: {predictions[i]}")
+                                print("\n")
+                            batch_idx = 0
+                    
+                except ValueError:
+                    print(f"경고: 올바른 형식의 데이터가 아닙니다 - {raw!r}")
+                except Exception as e:
+                    print(f"경고: 처리 중 오류 발생 - {e}")
 
     except KeyboardInterrupt:
         print("\n프로그램을 종료합니다.")
@@ -0,0 +1,20 @@
+"""
+classifier.py 예측 커널 AOT 빌드 스크립트
+numba.pycc로 ml_aot 확장 모듈을 생성하여 실행 시 JIT 컴파일(LLVM) 없이 커널을 사용합니다.
+
+사용법: python ml_aot_build.py
+"""
+
+import os
+from numba.pycc import CC
+from predict_kernel import predict_rows
+
+cc = CC('ml_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# float32 배치 입력 전용 시그니처 (out: int64 클래스 인덱스)
+cc.export('predict_rows_f32', 'void(f4[:,:], f4[:], f4[:], f4[:,:], f4[:], i8[:])')(predict_rows)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✅ AOT 모듈 빌드 완료: {cc.output_dir}")
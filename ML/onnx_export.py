@@ -0,0 +1,78 @@
+"""
+앙상블 모델 ONNX 내보내기 스크립트
+model_predictor.py의 1차 모델(lr, rf, dt, kn)을 ONNX로 변환하여 ONNX Runtime으로 추론합니다.
+입력은 정규화된 FSR 11개 특성(float32), 출력은 [예측 클래스, 확률 행렬(classes_ 순서)]입니다.
+
+--ensemble 옵션을 주면 ENSEMBLE_MODEL_NAMES 모델을 입력 하나로 묶은 model_ensemble.onnx도 생성합니다.
+출력은 모델별 확률 행렬(lr_probabilities, rf_probabilities, ...)이므로 서버는 그래프를 한 번 실행해
+개별 모델 결과(예측 로그)와 가중 투표를 모두 계산합니다 (가중치는 서버의 model_weights를 그대로 사용).
+그래프에 없는 모델은 서버가 기존처럼 모델별로 실행합니다.
+
+사용법: python onnx_export.py [--ensemble]  (skl2onnx 필요, 서버 실행에는 onnxruntime 필요)
+"""
+
+import os
+import sys
+import joblib
+import numpy as np
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_NAMES = ['lr', 'rf', 'dt', 'kn']
+# KNN은 ONNX 그래프(전체 학습 데이터 거리 계산 + TopK)가 sklearn보다 20배 이상 느려 통합 그래프에서 제외
+ENSEMBLE_MODEL_NAMES = ['lr', 'rf', 'dt']
+
+def convert_model(model_name):
+    model = joblib.load(os.path.join(ML_DIR, f'model_{model_name}.joblib'))
+    # zipmap=False: 확률을 dict 목록이 아닌 (N, 클래스 수) 텐서로 출력
+    return convert_sklearn(
+        model,
+        initial_types=[('X', FloatTensorType([None, 11]))],
+        options={id(model): {'zipmap': False}},
+    )
+
+def export_model(model_name):
+    onnx_model = convert_model(model_name)
+    onnx_path = os.path.join(ML_DIR, f'model_{model_name}.onnx')
+    with open(onnx_path, 'wb') as f:
+        f.write(onnx_model.SerializeToString())
+    return onnx_path
+
+def export_ensemble(onnx_path=os.path.join(ML_DIR, 'model_ensemble.onnx'), model_names=ENSEMBLE_MODEL_NAMES):
+    """모델별 그래프를 이름 접두사(lr_ 등)를 붙여 하나로 합치고, 입력 X를 공유해 모델별 확률을 함께 출력"""
+    import onnx
+    from onnx import compose, helper
+
+    nodes, initializers, outputs = [], [], []
+    opsets = {}
+    ir_version = None
+    for name in model_names:
+        model = compose.add_prefix(convert_model(name), f'{name}_')
+        nodes.append(helper.make_node('Identity', ['X'], [f'{name}_X'], name=f'{name}_input'))
+        nodes.extend(model.graph.node)
+        initializers.extend(model.graph.initializer)
+        outputs.extend(output for output in model.graph.output if output.name == f'{name}_probabilities')
+        for opset in model.opset_import:
+            opsets[opset.domain] = max(opsets.get(opset.domain, 0), opset.version)
+        ir_version = model.ir_version
+
+    graph = helper.make_graph(
+        nodes, 'posture_ensemble',
+        [helper.make_tensor_value_info('X', onnx.TensorProto.FLOAT, [None, 11])],
+        outputs, initializers,
+    )
+    merged = helper.make_model(graph, opset_imports=[helper.make_opsetid(domain, version)
+                                                     for domain, version in opsets.items()])
+    merged.ir_version = ir_version
+    onnx.checker.check_model(merged)
+
+    with open(onnx_path, 'wb') as f:
+        f.write(merged.SerializeToString())
+    return onnx_path
+
+if __name__ == "__main__":
+    for name in MODEL_NAMES:
+        print(f"✅ {name.upper()} 내보내기 완료: {export_model(name)}")
+    if '--ensemble' in sys.argv[1:]:
+        print(f"✅ 통합 앙상블 내보내기 완료: {export_ensemble()}")
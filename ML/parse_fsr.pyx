@@ -0,0 +1,38 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+FSR 시리얼 패킷 파서 (Cython)
+ASCII CSV 한 줄을 디코딩 없이 float32 버퍼로 직접 파싱합니다.
+
+빌드: cythonize -i parse_fsr.pyx
+"""
+
+from libc.stdlib cimport strtof
+
+cpdef int parse(bytes raw, float[::1] out):
+    """raw를 out에 파싱하고 값 개수를 반환 (out 크기 초과 또는 숫자가 아닌 값이 있으면 -1)"""
+    cdef const char* p = raw
+    cdef const char* end = p + len(raw)
+    cdef char* next_p
+    cdef Py_ssize_t n = 0
+    cdef float value
+
+    while p < end:
+        value = strtof(p, &next_p)
+        if next_p == p:
+            break
+        if n >= out.shape[0]:
+            return -1
+        out[n] = value
+        n += 1
+        p = next_p
+        # 구분자(쉼표)와 공백 건너뛰기
+        while p < end and (p[0] == b',' or p[0] == b' '):
+            p += 1
+
+    # 남은 문자는 줄바꿈/공백만 허용
+    while p < end:
+        if p[0] != b'\r' and p[0] != b'\n' and p[0] != b' ' and p[0] != b'\t':
+            return -1
+        p += 1
+
+    return n
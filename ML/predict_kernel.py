@@ -0,0 +1,23 @@
+"""
+classifier.py 예측 커널
+표준화와 선형 모델 예측을 하나의 루프로 수행합니다.
+Numba JIT(classifier.py)와 AOT 빌드(ml_aot_build.py)가 같은 구현을 공유합니다.
+"""
+
+import numpy as np
+
+def predict_rows(X, mean, inv_std, W, b, out):
+    """각 행을 표준화(in-place)하고 선형 모델 점수의 argmax 인덱스를 out에 기록"""
+    for r in range(X.shape[0]):
+        for i in range(X.shape[1]):
+            X[r, i] = (X[r, i] - mean[i]) * inv_std[i]
+        best_j = 0
+        best = -np.inf
+        for j in range(W.shape[1]):
+            acc = b[j]
+            for i in range(X.shape[1]):
+                acc += X[r, i] * W[i, j]
+            if acc > best:
+                best = acc
+                best_j = j
+        out[r] = best_j
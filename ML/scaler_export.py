@@ -0,0 +1,28 @@
+"""
+스케일러 통계 내보내기 스크립트
+scaler.joblib / scaler2.joblib(StandardScaler)의 mean_, scale_을 .npy 파일로 저장합니다.
+서버는 .npy 파일이 있으면 joblib(pickle) 대신 np.load로 정규화 통계만 읽어 시작 시간을 줄입니다.
+
+사용법: python scaler_export.py  (스케일러를 다시 학습하면 함께 다시 실행)
+"""
+
+import os
+import joblib
+import numpy as np
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+SCALER_NAMES = ['scaler', 'scaler2']
+
+def export_scaler(scaler_name):
+    scaler = joblib.load(os.path.join(ML_DIR, f'{scaler_name}.joblib'))
+    mean_path = os.path.join(ML_DIR, f'{scaler_name}_mean.npy')
+    scale_path = os.path.join(ML_DIR, f'{scaler_name}_scale.npy')
+    # with_mean/with_std=False로 학습된 경우 mean_/scale_이 None이므로 항등 변환 값으로 저장
+    n_features = scaler.n_features_in_
+    np.save(mean_path, np.zeros(n_features) if scaler.mean_ is None else scaler.mean_)
+    np.save(scale_path, np.ones(n_features) if scaler.scale_ is None else scaler.scale_)
+    return mean_path, scale_path
+
+if __name__ == "__main__":
+    for name in SCALER_NAMES:
+        print(f"✅ {name} 내보내기 완료: {', '.join(export_scaler(name))}")
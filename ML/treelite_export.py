@@ -0,0 +1,39 @@
+"""
+트리 모델 네이티브 컴파일 스크립트
+model_predictor.py의 rf, dt 모델을 treelite로 변환하고 tl2cgen으로 공유 라이브러리(.so)를 빌드합니다.
+서버는 tl2cgen이 설치되어 있으면 sklearn 트리 순회 대신 컴파일된 예측 함수를 사용합니다.
+
+사용법: python treelite_export.py  (treelite, tl2cgen, gcc 필요)
+"""
+
+import os
+import joblib
+import treelite
+import tl2cgen
+from sklearn.ensemble import RandomForestClassifier
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def as_forest(tree):
+    """treelite는 단일 DecisionTreeClassifier를 지원하지 않으므로 트리 하나짜리 포레스트로 감쌈"""
+    forest = RandomForestClassifier(n_estimators=1)
+    forest.estimators_ = [tree]
+    forest.estimator_ = tree
+    forest.classes_ = tree.classes_
+    forest.n_classes_ = tree.n_classes_
+    forest.n_outputs_ = tree.n_outputs_
+    forest.n_features_in_ = tree.n_features_in_
+    return forest
+
+def export_model(model_name):
+    model = joblib.load(os.path.join(ML_DIR, f'model_{model_name}.joblib'))
+    if model_name == 'dt':
+        model = as_forest(model)
+    tl_model = treelite.sklearn.import_model(model)
+    lib_path = os.path.join(ML_DIR, f'model_{model_name}.so')
+    tl2cgen.export_lib(tl_model, toolchain='gcc', libpath=lib_path, params={'parallel_comp': 4})
+    return lib_path
+
+if __name__ == "__main__":
+    for name in ['rf', 'dt']:
+        print(f"✅ {name.upper()} 컴파일 완료: {export_model(name)}")
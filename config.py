@@ -4,6 +4,7 @@
 """
 
 import os
+import re
 from pathlib import Path
 from typing import Any, Union
 import logging
@@ -11,23 +12,25 @@ import logging
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+# .env의 KEY=VALUE 줄 (주석/빈 줄은 매치되지 않음)
+_ENV_LINE_RE = re.compile(r'^[ \t]*([^#=\s]+)[ \t]*=[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+
 class Config:
     """환경 설정 클래스"""
     
     def __init__(self):
         self.load_env_file()
+        self.load_settings()
         
     def load_env_file(self):
         """환경 변수 파일 로드"""
         env_path = Path('.env')
         if env_path.exists():
             try:
-                with open(env_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#') and '=' in line:
-                            key, value = line.split('=', 1)
-                            os.environ[key.strip()] = value.strip()
+                data = env_path.read_text(encoding='utf-8')
+                # 이미 설정된 실제 환경 변수가 .env 값보다 우선
+                for match in _ENV_LINE_RE.finditer(data):
+                    os.environ.setdefault(match[1], match[2])
                 logger.info(f"환경 변수 파일 로드 완료: {env_path}")
             except Exception as e:
                 logger.warning(f"환경 변수 파일 로드 실패: {e}")
@@ -58,150 +61,61 @@ class Config:
         else:
             return str(value)
     
-    # 서버 설정
-    @property
-    def SERVER_HOST(self) -> str:
-        return self.get_env('SERVER_HOST', '0.0.0.0')
-    
-    @property
-    def SERVER_PORT(self) -> int:
-        return self.get_env('SERVER_PORT', 8765, int)
-    
-    @property
-    def WEBSOCKET_PORT(self) -> int:
-        return self.get_env('WEBSOCKET_PORT', 8765, int)
-    
-    @property
-    def API_PORT(self) -> int:
-        return self.get_env('API_PORT', 8766, int)
-    
-    @property
-    def SERVER_PING_INTERVAL(self) -> int:
-        return self.get_env('SERVER_PING_INTERVAL', 30, int)
-    
-    @property
-    def SERVER_PING_TIMEOUT(self) -> int:
-        return self.get_env('SERVER_PING_TIMEOUT', 10, int)
-    
-    # 데이터베이스 설정
-    @property
-    def DATABASE_PATH(self) -> str:
-        return self.get_env('DATABASE_PATH', 'posture_data.db')
-    
-    @property
-    def DATABASE_BACKUP_ENABLED(self) -> bool:
-        return self.get_env('DATABASE_BACKUP_ENABLED', True, bool)
-    
-    @property
-    def DATABASE_BACKUP_INTERVAL(self) -> int:
-        return self.get_env('DATABASE_BACKUP_INTERVAL', 3600, int)
-    
-    # 머신러닝 모델 설정
-    @property
-    def MODEL_PATH(self) -> str:
-        return self.get_env('MODEL_PATH', 'model_lr.joblib')
-    
-    @property
-    def MODEL_CONFIDENCE_THRESHOLD(self) -> float:
-        return self.get_env('MODEL_CONFIDENCE_THRESHOLD', 0.1, float)
-    
-    @property
-    def MODEL_FALLBACK_ENABLED(self) -> bool:
-        return self.get_env('MODEL_FALLBACK_ENABLED', True, bool)
-    
-    # 로깅 설정
-    @property
-    def LOG_LEVEL(self) -> str:
-        return self.get_env('LOG_LEVEL', 'INFO').upper()
-    
-    @property
-    def LOG_FILE(self) -> str:
-        return self.get_env('LOG_FILE', 'posture_server.log')
-    
-    @property
-    def LOG_MAX_SIZE(self) -> int:
-        return self.get_env('LOG_MAX_SIZE', 10485760, int)  # 10MB
-    
-    @property
-    def LOG_BACKUP_COUNT(self) -> int:
-        return self.get_env('LOG_BACKUP_COUNT', 5, int)
-    
-    @property
-    def LOG_CONSOLE_ENABLED(self) -> bool:
-        return self.get_env('LOG_CONSOLE_ENABLED', True, bool)
-    
-    # 성능 모니터링 설정
-    @property
-    def PERFORMANCE_STATS_INTERVAL(self) -> int:
-        return self.get_env('PERFORMANCE_STATS_INTERVAL', 60, int)
-    
-    @property
-    def MAX_CLIENTS(self) -> int:
-        return self.get_env('MAX_CLIENTS', 100, int)
-    
-    @property
-    def MAX_RESPONSE_TIME_MS(self) -> int:
-        return self.get_env('MAX_RESPONSE_TIME_MS', 5000, int)
-    
-    # FSR 센서 설정
-    @property
-    def FSR_SENSOR_COUNT(self) -> int:
-        return self.get_env('FSR_SENSOR_COUNT', 11, int)
-    
-    @property
-    def FSR_VALUE_MIN(self) -> int:
-        return self.get_env('FSR_VALUE_MIN', 0, int)
-    
-    @property
-    def FSR_VALUE_MAX(self) -> int:
-        return self.get_env('FSR_VALUE_MAX', 1024, int)
-    
-    @property
-    def FSR_VALIDATION_ENABLED(self) -> bool:
-        return self.get_env('FSR_VALIDATION_ENABLED', True, bool)
-    
-    # 보안 설정
-    @property
-    def ENABLE_CLIENT_AUTH(self) -> bool:
-        return self.get_env('ENABLE_CLIENT_AUTH', False, bool)
-    
-    @property
-    def CLIENT_AUTH_TOKEN(self) -> str:
-        return self.get_env('CLIENT_AUTH_TOKEN', '')
-    
-    @property
-    def CORS_ENABLED(self) -> bool:
-        return self.get_env('CORS_ENABLED', True, bool)
-    
-    @property
-    def CORS_ORIGINS(self) -> str:
-        return self.get_env('CORS_ORIGINS', '*')
-    
-    # 개발/디버그 설정
-    @property
-    def DEBUG_MODE(self) -> bool:
-        return self.get_env('DEBUG_MODE', False, bool)
-    
-    @property
-    def TEST_MODE(self) -> bool:
-        return self.get_env('TEST_MODE', False, bool)
-    
-    @property
-    def DUMMY_MODEL_ENABLED(self) -> bool:
-        return self.get_env('DUMMY_MODEL_ENABLED', False, bool)
-    
-    # 데이터 저장 설정
-    @property
-    def SAVE_RAW_DATA(self) -> bool:
-        return self.get_env('SAVE_RAW_DATA', True, bool)
-    
-    @property
-    def SAVE_PREDICTIONS(self) -> bool:
-        return self.get_env('SAVE_PREDICTIONS', True, bool)
-    
-    @property
-    def DATA_RETENTION_DAYS(self) -> int:
-        return self.get_env('DATA_RETENTION_DAYS', 30, int)
+    def load_settings(self):
+        """환경 변수 값을 한 번만 읽어 속성으로 저장"""
+        # 서버 설정
+        self.SERVER_HOST: str = self.get_env('SERVER_HOST', '0.0.0.0')
+        self.SERVER_PORT: int = self.get_env('SERVER_PORT', 8765, int)
+        self.WEBSOCKET_PORT: int = self.get_env('WEBSOCKET_PORT', 8765, int)
+        self.API_PORT: int = self.get_env('API_PORT', 8766, int)
+        self.SERVER_PING_INTERVAL: int = self.get_env('SERVER_PING_INTERVAL', 30, int)
+        self.SERVER_PING_TIMEOUT: int = self.get_env('SERVER_PING_TIMEOUT', 10, int)
+        
+        # 데이터베이스 설정
+        self.DATABASE_PATH: str = self.get_env('DATABASE_PATH', 'posture_data.db')
+        self.DATABASE_BACKUP_ENABLED: bool = self.get_env('DATABASE_BACKUP_ENABLED', True, bool)
+        self.DATABASE_BACKUP_INTERVAL: int = self.get_env('DATABASE_BACKUP_INTERVAL', 3600, int)
+        
+        # 머신러닝 모델 설정
+        self.MODEL_PATH: str = self.get_env('MODEL_PATH', 'model_lr.joblib')
+        self.MODEL_CONFIDENCE_THRESHOLD: float = self.get_env('MODEL_CONFIDENCE_THRESHOLD', 0.1, float)
+        self.MODEL_FALLBACK_ENABLED: bool = self.get_env('MODEL_FALLBACK_ENABLED', True, bool)
+        self.PRELOAD_MODELS: bool = self.get_env('PRELOAD_MODELS', True, bool)  # false면 첫 예측 요청 때 모델 로드
+        
+        # 로깅 설정
+        self.LOG_LEVEL: str = self.get_env('LOG_LEVEL', 'INFO').upper()
+        self.LOG_FILE: str = self.get_env('LOG_FILE', 'posture_server.log')
+        self.LOG_MAX_SIZE: int = self.get_env('LOG_MAX_SIZE', 10485760, int)  # 10MB
+        self.LOG_BACKUP_COUNT: int = self.get_env('LOG_BACKUP_COUNT', 5, int)
+        self.LOG_CONSOLE_ENABLED: bool = self.get_env('LOG_CONSOLE_ENABLED', True, bool)
+        
+        # 성능 모니터링 설정
+        self.PERFORMANCE_STATS_INTERVAL: int = self.get_env('PERFORMANCE_STATS_INTERVAL', 60, int)
+        self.MAX_CLIENTS: int = self.get_env('MAX_CLIENTS', 100, int)
+        self.MAX_RESPONSE_TIME_MS: int = self.get_env('MAX_RESPONSE_TIME_MS', 5000, int)
+        
+        # FSR 센서 설정
+        self.FSR_SENSOR_COUNT: int = self.get_env('FSR_SENSOR_COUNT', 11, int)
+        self.FSR_VALUE_MIN: int = self.get_env('FSR_VALUE_MIN', 0, int)
+        self.FSR_VALUE_MAX: int = self.get_env('FSR_VALUE_MAX', 1024, int)
+        self.FSR_VALIDATION_ENABLED: bool = self.get_env('FSR_VALIDATION_ENABLED', True, bool)
+        
+        # 보안 설정
+        self.ENABLE_CLIENT_AUTH: bool = self.get_env('ENABLE_CLIENT_AUTH', False, bool)
+        self.CLIENT_AUTH_TOKEN: str = self.get_env('CLIENT_AUTH_TOKEN', '')
+        self.CORS_ENABLED: bool = self.get_env('CORS_ENABLED', True, bool)
+        self.CORS_ORIGINS: str = self.get_env('CORS_ORIGINS', '*')
+        
+        # 개발/디버그 설정
+        self.DEBUG_MODE: bool = self.get_env('DEBUG_MODE', False, bool)
+        self.TEST_MODE: bool = self.get_env('TEST_MODE', False, bool)
+        self.DUMMY_MODEL_ENABLED: bool = self.get_env('DUMMY_MODEL_ENABLED', False, bool)
+        
+        # 데이터 저장 설정
+        self.SAVE_RAW_DATA: bool = self.get_env('SAVE_RAW_DATA', True, bool)
+        self.SAVE_PREDICTIONS: bool = self.get_env('SAVE_PREDICTIONS', True, bool)
+        self.PREDICTION_LOG_PACKED: bool = self.get_env('PREDICTION_LOG_PACKED', False, bool)  # 예측 로그를 배치별 압축 BLOB으로 저장
+        self.DATA_RETENTION_DAYS: int = self.get_env('DATA_RETENTION_DAYS', 30, int)
     
     def get_log_level_int(self) -> int:
         """로그 레벨을 정수로 변환"""
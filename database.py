@@ -1,20 +1,170 @@
 import sqlite3
+import ast
 import asyncio
+import atexit
+import json
+import threading
+import time
 from datetime import datetime
 import logging
+import numpy as np
 from config import config
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+# 예측 결과 일괄 저장 설정
+PREDICTION_FLUSH_SIZE = 64       # 대기열이 이 개수에 도달하면 저장
+PREDICTION_FLUSH_INTERVAL = 1.0  # 마지막 저장 후 이 시간(초)이 지나면 저장 (새 예측이 없어도 주기 저장 태스크가 저장)
+PREDICTION_PENDING_MAX = 10000   # 저장 실패로 되돌린 행을 포함한 대기열 최대 크기 (초과 시 오래된 행부터 버림)
+POSTURE_STATS_TTL = 30.0         # 자세 통계 조회 결과 캐시 유지 시간(초)
+# 재사용하는 연결의 SQLite 페이지 캐시 크기 (음수: KiB 단위, 약 64MB, 사용한 만큼만 할당)
+# 연결이 호출 간 유지되므로 기본(약 2MB)보다 크게 잡아 조회의 디스크 읽기 감소
+SQLITE_CACHE_SIZE_KIB = 64000
+
+# 자주 실행되는 쿼리 (동일한 SQL 문자열을 재사용해 연결의 statement 캐시 활용)
+INSERT_PREDICTION_SQL = '''
+    INSERT INTO posture_predictions 
+    (client_id, device_id, predicted_posture, confidence, imu_data, fsr_data)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_CONNECTION_SQL = '''
+    INSERT INTO client_connections (client_id, device_id)
+    VALUES (?, ?)
+'''
+
+UPDATE_DISCONNECTION_SQL = '''
+    UPDATE client_connections 
+    SET disconnect_time = CURRENT_TIMESTAMP, is_active = FALSE
+    WHERE client_id = ? AND is_active = TRUE
+'''
+
+# 레이블은 변하지 않으므로 JOIN 없이 집계하고 레이블은 메모리의 dict에서 붙임
+SELECT_POSTURE_STATS_SQL = '''
+    SELECT predicted_posture, COUNT(*) as count,
+           AVG(confidence) as avg_confidence,
+           MAX(timestamp) as last_detected
+    FROM posture_predictions
+    WHERE timestamp >= datetime('now', '-1 day')
+    GROUP BY predicted_posture
+    ORDER BY count DESC
+    LIMIT ?
+'''
+
+SELECT_POSTURE_LABELS_SQL = "SELECT posture_id, label_ko FROM posture_labels"
+
+def encode_sensor_data(data):
+    """센서 데이터를 DB 저장 형식으로 변환 (숫자 배열은 float32 BLOB, dict는 JSON 문자열)"""
+    if data is None:
+        return None
+    if isinstance(data, (list, tuple, np.ndarray)):
+        return np.asarray(data, dtype=np.float32).tobytes()
+    return json.dumps(data)
+
+def decode_sensor_data(value):
+    """posture_predictions의 imu_data/fsr_data 값을 Python 값으로 복원 (숫자 배열은 list, dict는 dict)
+
+    BLOB 저장 이전에 만든 DB의 행은 str(data) 텍스트(예: "[1, 2]", "{'relativePitch': 3.0}", "None")이므로
+    BLOB, JSON 문자열, 기존 텍스트 형식을 모두 처리한다.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (bytes, memoryview)):
+        return np.frombuffer(value, dtype=np.float32).tolist()
+    try:
+        return json.loads(value)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(value)  # 기존 str() 텍스트 ("None"도 None으로 복원)
+    except (ValueError, SyntaxError):
+        return value
+
+def get_thread_connection(local, db_path, row_factory=None):
+    """스레드별로 재사용하는 SQLite 연결 반환 (스레드에서 처음 호출될 때 한 번만 생성)
+
+    with 문으로 사용하면 기존처럼 블록 종료 시 커밋/롤백되며, 연결은 닫지 않고 다음 호출에서 재사용한다.
+    """
+    conn = getattr(local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KIB}")
+        if row_factory is not None:
+            conn.row_factory = row_factory
+        local.conn = conn
+    return conn
+
+def run_batch_writer(queue, db_path, query, max_batch, pack=None, linger=0.0, on_batch=None, serialize=None):
+    """저장 스레드에서 실행되는 일괄 저장 루프 (None을 받으면 남은 행을 저장하고 종료)
+
+    전용 연결을 이 스레드에서 열어 사용한다. queue에서 행 튜플을 받아 최대 max_batch개씩 하나의 트랜잭션으로 저장하므로
+    호출 측은 디스크 동기화(fsync)를 기다리지 않는다.
+    pack이 주어지면 모은 행 목록을 pack(rows)의 결과(예: 압축 행)로 바꿔 저장한다.
+    linger(초)가 0보다 크면 첫 행을 받은 뒤 그 시간 동안 행을 더 모아 한 번에 저장한다.
+    on_batch가 주어지면 같은 트랜잭션 안에서 on_batch(conn, rows)를 호출한다 (예: 집계 테이블 갱신).
+    serialize가 주어지면 모은 행 목록을 먼저 serialize(rows)로 변환한다 (예: JSON 직렬화를 호출 측 대신 수행).
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    
+    running = True
+    while running:
+        row = queue.get()
+        if row is None:
+            break
+        rows = [row]
+        deadline = time.monotonic() + linger
+        while len(rows) < max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                row = queue.get(timeout=remaining) if remaining > 0 else queue.get_nowait()
+            except Exception:  # queue.Empty
+                break
+            if row is None:
+                running = False
+                break
+            rows.append(row)
+        
+        try:
+            if serialize is not None:
+                rows = serialize(rows)
+            conn.execute("BEGIN")
+            conn.executemany(query, pack(rows) if pack is not None else rows)
+            if on_batch is not None:
+                on_batch(conn, rows)
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.error(f"일괄 저장 오류 ({len(rows)}건 유실): {e}")
+    
+    conn.close()
+
 class PostureDatabase:
     def __init__(self, db_path=None):
         self.db_path = db_path or config.DATABASE_PATH
         self.init_database()
+        
+        # 예측 결과 저장용 장기 연결 (WAL 모드, 트랜잭션은 직접 관리)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KIB}")
+        self._pending_predictions = []
+        self._last_flush = time.monotonic()
+        self._write_lock = threading.Lock()
+        self._labels = dict(self._conn.execute(SELECT_POSTURE_LABELS_SQL).fetchall())
+        self._stats_cache = {}  # limit -> (만료 시각, 결과)
+        self._local = threading.local()  # 조회용 스레드별 연결
+        atexit.register(self.close)
     
     def get_connection(self):
-        """데이터베이스 연결 반환"""
-        return sqlite3.connect(self.db_path)
+        """데이터베이스 연결 반환 (스레드별 연결 재사용)"""
+        return get_thread_connection(self._local, self.db_path)
     
     def init_database(self):
         """데이터베이스와 테이블 초기화"""
@@ -31,8 +181,8 @@ class PostureDatabase:
                         timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                         predicted_posture INTEGER NOT NULL,
                         confidence REAL NOT NULL,
-                        imu_data TEXT,
-                        fsr_data TEXT,
+                        imu_data BLOB,
+                        fsr_data BLOB,
                         created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                     )
                 ''')
@@ -85,36 +235,105 @@ class PostureDatabase:
             raise
     
     async def save_prediction(self, client_id, device_id, posture, confidence, imu_data=None, fsr_data=None):
-        """자세 예측 결과를 데이터베이스에 저장"""
+        """자세 예측 결과를 저장 대기열에 추가 (일정 개수/시간마다 일괄 저장)"""
+        self._pending_predictions.append(
+            (client_id, device_id, int(posture), float(confidence),
+             encode_sensor_data(imu_data), encode_sensor_data(fsr_data))
+        )
+        logger.debug(f"예측 결과 저장 대기 - 자세: {posture}, 신뢰도: {confidence:.3f}")
+        
+        if (len(self._pending_predictions) >= PREDICTION_FLUSH_SIZE or
+                time.monotonic() - self._last_flush >= PREDICTION_FLUSH_INTERVAL):
+            await self._flush_pending_predictions()
+    
+    async def _flush_pending_predictions(self):
+        """대기 중인 예측 결과를 워커 스레드에서 저장 (실패하면 대기열로 되돌려 다음 저장 때 재시도)"""
+        # 대기열은 이벤트 루프에서 분리하고, 블로킹 DB 쓰기는 워커 스레드에서 수행
+        rows = self._take_pending_predictions()
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO posture_predictions 
-                    (client_id, device_id, predicted_posture, confidence, imu_data, fsr_data)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (client_id, device_id, posture, confidence, str(imu_data), str(fsr_data)))
-                conn.commit()
-                
-                prediction_id = cursor.lastrowid
-                logger.info(f"예측 결과 저장 완료 - ID: {prediction_id}, 자세: {posture}, 신뢰도: {confidence:.3f}")
-                return prediction_id
+            await asyncio.to_thread(self._write_predictions, rows)
+        except Exception:
+            self._requeue_predictions(rows)  # 오류 로그는 _write_predictions에서 기록
+    
+    async def run_periodic_flush(self, interval=PREDICTION_FLUSH_INTERVAL):
+        """새 예측이 들어오지 않아도 대기 중인 예측 결과를 주기적으로 저장 (서버 시작 시 태스크로 실행)"""
+        while True:
+            await asyncio.sleep(interval)
+            if self._pending_predictions and time.monotonic() - self._last_flush >= interval:
+                await self._flush_pending_predictions()
+    
+    def _requeue_predictions(self, rows):
+        """저장에 실패한 행을 대기열 앞쪽에 되돌림 (최대 PREDICTION_PENDING_MAX개, 초과분은 오래된 행부터 버림)"""
+        self._pending_predictions[:0] = rows
+        overflow = len(self._pending_predictions) - PREDICTION_PENDING_MAX
+        if overflow > 0:
+            del self._pending_predictions[:overflow]
+            logger.warning(f"예측 결과 대기열 초과 - 오래된 {overflow}건 유실")
+    
+    def _take_pending_predictions(self):
+        """대기 중인 예측 결과를 꺼내고 대기열 초기화"""
+        rows = self._pending_predictions
+        self._pending_predictions = []
+        self._last_flush = time.monotonic()
+        return rows
+    
+    def write_many(self, query, rows):
+        """여러 행을 장기 연결에서 하나의 트랜잭션으로 저장"""
+        if not rows:
+            return 0
+        
+        with self._write_lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(query, rows)
+                self._conn.execute("COMMIT")
+                return len(rows)
                 
+            except Exception:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+    
+    def _write_predictions(self, rows):
+        """예측 결과를 하나의 트랜잭션으로 저장"""
+        if not rows:
+            return 0
+        
+        try:
+            count = self.write_many(INSERT_PREDICTION_SQL, rows)
+            logger.info(f"예측 결과 저장 완료 - {count}건")
+            return count
+            
         except Exception as e:
             logger.error(f"예측 결과 저장 오류: {e}")
             raise
     
+    def flush_predictions(self):
+        """대기 중인 예측 결과를 즉시 저장"""
+        return self._write_predictions(self._take_pending_predictions())
+    
+    def _execute_write(self, query, params):
+        """장기 연결에서 단일 쓰기 쿼리 실행 (자동 커밋)"""
+        with self._write_lock:
+            self._conn.execute(query, params)
+    
+    def close(self):
+        """대기 중인 예측 결과를 저장하고 연결 종료"""
+        if self._conn is None:
+            return
+        try:
+            self.flush_predictions()
+        except Exception:
+            pass
+        finally:
+            self._conn.close()
+            self._conn = None
+    
     async def log_client_connection(self, client_id, device_id=None):
         """클라이언트 연결 로그"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO client_connections (client_id, device_id)
-                    VALUES (?, ?)
-                ''', (client_id, device_id))
-                conn.commit()
-                logger.info(f"클라이언트 연결 기록 - ID: {client_id}")
+            await asyncio.to_thread(self._execute_write, INSERT_CONNECTION_SQL, (client_id, device_id))
+            logger.info(f"클라이언트 연결 기록 - ID: {client_id}")
                 
         except Exception as e:
             logger.error(f"클라이언트 연결 로그 오류: {e}")
@@ -122,47 +341,37 @@ class PostureDatabase:
     async def log_client_disconnection(self, client_id):
         """클라이언트 연결 해제 로그"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE client_connections 
-                    SET disconnect_time = CURRENT_TIMESTAMP, is_active = FALSE
-                    WHERE client_id = ? AND is_active = TRUE
-                ''', (client_id,))
-                conn.commit()
-                logger.info(f"클라이언트 연결 해제 기록 - ID: {client_id}")
+            await asyncio.to_thread(self._execute_write, UPDATE_DISCONNECTION_SQL, (client_id,))
+            logger.info(f"클라이언트 연결 해제 기록 - ID: {client_id}")
                 
         except Exception as e:
             logger.error(f"클라이언트 연결 해제 로그 오류: {e}")
     
     def get_posture_stats(self, limit=100):
-        """최근 자세 통계 조회"""
+        """최근 자세 통계 조회 (대시보드용이므로 POSTURE_STATS_TTL초 동안 결과 캐시)"""
+        now = time.monotonic()
+        cached = self._stats_cache.get(limit)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT pp.predicted_posture, pl.label_ko, COUNT(*) as count,
-                           AVG(pp.confidence) as avg_confidence,
-                           MAX(pp.timestamp) as last_detected
-                    FROM posture_predictions pp
-                    JOIN posture_labels pl ON pp.predicted_posture = pl.posture_id
-                    WHERE pp.timestamp >= datetime('now', '-1 day')
-                    GROUP BY pp.predicted_posture, pl.label_ko
-                    ORDER BY count DESC
-                    LIMIT ?
-                ''', (limit,))
-                
-                results = cursor.fetchall()
-                return [
-                    {
-                        'posture_id': row[0],
-                        'label': row[1],
-                        'count': row[2],
-                        'avg_confidence': round(row[3], 3),
-                        'last_detected': row[4]
-                    }
-                    for row in results
-                ]
+            with self._write_lock:
+                results = self._conn.execute(SELECT_POSTURE_STATS_SQL, (limit,)).fetchall()
+            
+            labels = self._labels
+            stats = [
+                {
+                    'posture_id': row[0],
+                    'label': labels[row[0]],
+                    'count': row[1],
+                    'avg_confidence': round(row[2], 3),
+                    'last_detected': row[3]
+                }
+                for row in results
+                if row[0] in labels  # 레이블 없는 자세는 기존 JOIN과 동일하게 제외
+            ]
+            self._stats_cache[limit] = (now + POSTURE_STATS_TTL, stats)
+            return stats
                 
         except Exception as e:
             logger.error(f"자세 통계 조회 오류: {e}")
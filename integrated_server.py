@@ -7,6 +7,7 @@ import threading
 import uvicorn
 from websocket_server import start_websocket_server
 from statistics_api import app as fastapi_app
+from model_predictor import get_predictor, EnsemblePosturePredictor
 from config import config
 import logging
 
@@ -15,6 +16,10 @@ logger = logging.getLogger(__name__)
 
 def run_fastapi_server():
     """FastAPI 서버 실행 (별도 스레드)"""
+    # API 스레드 전용 예측기: 모델은 WebSocket 예측기와 공유하고 작업 버퍼만 분리
+    # (PRELOAD_MODELS=false면 만들지 않음 - API는 필요할 때 get_predictor()로 전역 예측기를 생성)
+    if config.PRELOAD_MODELS:
+        fastapi_app.state.predictor = EnsemblePosturePredictor(share_from=get_predictor())
     uvicorn.run(
         fastapi_app,
         host="0.0.0.0",
@@ -33,6 +38,10 @@ async def main():
     logger.info(f"REST API 서버: http://0.0.0.0:{config.API_PORT}")
     logger.info("==============================")
     
+    # 모델 로드 (예측기는 처음 요청될 때 생성되므로 서버 스레드 시작 전에 메인 스레드에서 준비)
+    if config.PRELOAD_MODELS:
+        get_predictor()
+    
     # FastAPI 서버를 별도 스레드에서 실행
     fastapi_thread = threading.Thread(target=run_fastapi_server, daemon=True)
     fastapi_thread.start()
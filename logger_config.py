@@ -1,11 +1,80 @@
+import atexit
 import logging
 import logging.handlers
 import os
-from datetime import datetime
+import queue
 from config import config
 
-def setup_logging(log_level=None, log_file=None):
-    """로깅 시스템 설정"""
+# 헬퍼 함수들이 공유하는 모듈 로거 (호출마다 getLogger로 조회하지 않음)
+logger = logging.getLogger(__name__)
+
+# 반복 사용되는 구분선 문자열 (호출마다 이어붙이지 않도록 미리 생성)
+_RULE_60 = "=" * 60
+_RULE_50 = "=" * 50
+_PRED_HEADER = "🔍 [예측 시작] " + "=" * 50
+_PRED_FOOTER = "🏁 [예측 완료] " + "=" * 50
+_STAGE2_FOOTER = "🏁 [2차 분류 완료] " + "=" * 30
+
+# 실제 파일/콘솔 출력을 담당하는 백그라운드 리스너
+_queue_listener = None
+
+def stop_logging():
+    """백그라운드 로그 리스너 종료 (대기 중인 로그를 모두 기록한 뒤 종료)"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+atexit.register(stop_logging)
+
+# 파일 크기 확인(seek/tell) 주기: 이 개수의 레코드마다 한 번만 로테이션 여부 확인
+LOG_ROLLOVER_CHECK_INTERVAL = 256
+
+class _CountingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """일정 개수마다 로테이션 여부를 확인하고, 레코드를 바이트로 직접 기록하는 파일 핸들러"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._emit_count = 0
+    
+    def shouldRollover(self, record):
+        self._emit_count += 1
+        if self._emit_count < LOG_ROLLOVER_CHECK_INTERVAL:
+            return False
+        self._emit_count = 0
+        return super().shouldRollover(record)
+    
+    def emit(self, record):
+        """포맷된 레코드를 UTF-8 바이트로 한 번에 인코딩해 파일 디스크립터에 직접 기록"""
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            data = (self.format(record) + self.terminator).encode(self.encoding or 'utf-8', self.errors or 'strict')
+            # 텍스트 스트림 버퍼를 거치지 않으므로 flush가 필요 없음 (append 모드라 항상 파일 끝에 기록)
+            fd = self.stream.fileno()
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        except Exception:
+            self.handleError(record)
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """레코드를 포맷하지 않고 그대로 큐에 넣는 핸들러 (메시지 포맷은 리스너 스레드에서 수행)"""
+    
+    def prepare(self, record):
+        # 같은 프로세스 안의 리스너가 소비하므로 pickle 대비 사전 포맷이 필요 없음
+        return record
+
+def setup_logging(log_level=None, log_file=None, force=False):
+    """로깅 시스템 설정 (이미 설정된 경우 force=True일 때만 다시 설정)"""
+    global _queue_listener
+    
+    # 여러 진입점에서 호출되어도 핸들러가 중복 설치되지 않도록 한 번만 설정
+    root_logger = logging.getLogger()
+    if getattr(root_logger, '_posture_configured', False) and not force:
+        return root_logger
     
     # 환경 변수에서 설정값 가져오기
     if log_level is None:
@@ -26,10 +95,10 @@ def setup_logging(log_level=None, log_file=None):
     )
     
     # 루트 로거 설정
-    root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
     
-    # 기존 핸들러 제거
+    # 기존 핸들러 및 리스너 제거
+    stop_logging()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
@@ -37,10 +106,9 @@ def setup_logging(log_level=None, log_file=None):
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
     console_handler.setFormatter(log_format)
-    root_logger.addHandler(console_handler)
     
-    # 파일 핸들러 설정 (로테이션 지원)
-    file_handler = logging.handlers.RotatingFileHandler(
+    # 파일 핸들러 설정 (로테이션 지원, 크기 확인은 LOG_ROLLOVER_CHECK_INTERVAL개마다)
+    file_handler = _CountingRotatingFileHandler(
         log_file_path, 
         maxBytes=config.LOG_MAX_SIZE,
         backupCount=config.LOG_BACKUP_COUNT,
@@ -48,64 +116,73 @@ def setup_logging(log_level=None, log_file=None):
     )
     file_handler.setLevel(log_level)
     file_handler.setFormatter(log_format)
-    root_logger.addHandler(file_handler)
+    
+    # 로그 호출 스레드(이벤트 루프 등)는 큐에 넣기만 하고, 실제 I/O는 리스너 스레드에서 수행
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(_DeferredQueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
     
     # WebSocket 라이브러리 로그 레벨 조정 (너무 상세한 로그 방지)
     logging.getLogger('websockets').setLevel(logging.WARNING)
     
     logging.info("로깅 시스템 초기화 완료")
-    logging.info(f"로그 레벨: {logging.getLevelName(log_level)}")
-    logging.info(f"로그 파일: {log_file_path}")
+    logging.info("로그 레벨: %s", logging.getLevelName(log_level))
+    logging.info("로그 파일: %s", log_file_path)
     
+    root_logger._posture_configured = True
     return root_logger
 
 def log_server_start():
     """서버 시작 로그"""
-    logger = logging.getLogger(__name__)
-    logger.info("=" * 60)
+    logger.info(_RULE_60)
     logger.info("자세 인식 WebSocket 서버 시작")
-    logger.info(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    logger.info("=" * 60)
+    logger.info(_RULE_60)
 
 def log_server_shutdown():
     """서버 종료 로그"""
-    logger = logging.getLogger(__name__)
-    logger.info("=" * 60)
+    logger.info(_RULE_60)
     logger.info("자세 인식 WebSocket 서버 종료")
-    logger.info(f"종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    logger.info("=" * 60)
+    logger.info(_RULE_60)
 
 def log_client_data(client_id, data_type, data_size):
     """클라이언트 데이터 수신 로그"""
-    logger = logging.getLogger(__name__)
-    logger.debug(f"클라이언트 {client_id}로부터 {data_type} 데이터 수신 (크기: {data_size} bytes)")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("클라이언트 %s로부터 %s 데이터 수신 (크기: %d bytes)", client_id, data_type, data_size)
 
 def log_prediction_result(client_id, posture, confidence, processing_time_ms):
     """예측 결과 로그"""
-    logger = logging.getLogger(__name__)
-    logger.info(f"예측 완료 - 클라이언트: {client_id}, 자세: {posture}, 신뢰도: {confidence:.3f}, 처리시간: {processing_time_ms:.1f}ms")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("예측 완료 - 클라이언트: %s, 자세: %s, 신뢰도: %.3f, 처리시간: %.1fms",
+                    client_id, posture, confidence, processing_time_ms)
 
 def log_error(error_type, error_message, client_id=None):
     """에러 로그"""
-    logger = logging.getLogger(__name__)
     if client_id:
-        logger.error(f"[{error_type}] 클라이언트 {client_id}: {error_message}")
+        logger.error("[%s] 클라이언트 %s: %s", error_type, client_id, error_message)
     else:
-        logger.error(f"[{error_type}] {error_message}")
+        logger.error("[%s] %s", error_type, error_message)
 
 def log_performance_metrics(total_clients, predictions_per_second, avg_response_time_ms):
     """성능 메트릭 로그"""
-    logger = logging.getLogger(__name__)
-    logger.info(f"성능 메트릭 - 연결 클라이언트: {total_clients}, 초당 예측: {predictions_per_second:.1f}, 평균 응답시간: {avg_response_time_ms:.1f}ms")
+    logger.info("성능 메트릭 - 연결 클라이언트: %s, 초당 예측: %.1f, 평균 응답시간: %.1fms",
+                total_clients, predictions_per_second, avg_response_time_ms)
+
+def prediction_log_enabled():
+    """log_prediction_detailed 출력 여부 (꺼져 있으면 상세 예측 정보를 만들 필요 없음)"""
+    return logger.isEnabledFor(logging.INFO)
 
 def log_prediction_detailed(client_id, device_id, fsr_data, prediction_details, processing_time):
     """상세 예측 과정 로그"""
-    logger = logging.getLogger(__name__)
+    if not logger.isEnabledFor(logging.INFO):
+        return
     
     # 기본 정보
-    logger.info("🔍 [예측 시작] " + "="*50)
-    logger.info(f"📱 클라이언트: {client_id} | 디바이스: {device_id}")
-    logger.info(f"📊 FSR 데이터: {fsr_data}")
+    logger.info(_PRED_HEADER)
+    logger.info("📱 클라이언트: %s | 디바이스: %s", client_id, device_id)
+    logger.info("📊 FSR 데이터: %s", fsr_data)
     
     # 개별 모델 예측 결과
     if 'individual_predictions' in prediction_details:
@@ -115,103 +192,107 @@ def log_prediction_detailed(client_id, device_id, fsr_data, prediction_details,
         
         for model_name, prediction in individual_preds.items():
             confidence = individual_confs.get(model_name, 0.0)
-            logger.info(f"  • {model_name.upper()}: 자세 {prediction} (신뢰도 {confidence:.3f})")
+            logger.info("  • %s: 자세 %s (신뢰도 %.3f)", model_name.upper(), prediction, confidence)
     
     # 투표 점수
-    if 'voting_scores' in prediction_details:
-        voting_scores = prediction_details['voting_scores']
+    # 0이 아닌 점수만 한 번에 골라 출력
+    nonzero_scores = [(i, score) for i, score in enumerate(prediction_details.get('voting_scores', ())) if score > 0]
+    if nonzero_scores:
         logger.info("🗳️  앙상블 투표 점수:")
-        for i, score in enumerate(voting_scores):
-            if score > 0:
-                logger.info(f"  • 자세 {i}: {score:.3f}")
+        for i, score in nonzero_scores:
+            logger.info("  • 자세 %d: %.3f", i, score)
     
     # 최종 결과
     final_pred = prediction_details.get('ensemble_prediction', 0)
     final_conf = prediction_details.get('ensemble_confidence', 0.0)
-    logger.info(f"✅ 최종 예측: 자세 {final_pred} (신뢰도 {final_conf:.3f})")
-    logger.info(f"⏱️  처리 시간: {processing_time:.1f}ms")
-    logger.info("🏁 [예측 완료] " + "="*50)
+    logger.info("✅ 최종 예측: 자세 %s (신뢰도 %.3f)", final_pred, final_conf)
+    logger.info("⏱️  처리 시간: %.1fms", processing_time)
+    logger.info(_PRED_FOOTER)
 
 def log_model_loading():
     """모델 로딩 과정 로그"""
-    logger = logging.getLogger(__name__)
     logger.info("🚀 앙상블 모델 시스템 초기화 중...")
 
 def log_model_loaded(model_name, success=True):
     """개별 모델 로드 결과 로그"""
-    logger = logging.getLogger(__name__)
     if success:
-        logger.info(f"  ✅ {model_name.upper()} 모델 로드 성공")
+        logger.info("  ✅ %s 모델 로드 성공", model_name.upper())
     else:
-        logger.warning(f"  ❌ {model_name.upper()} 모델 로드 실패")
+        logger.warning("  ❌ %s 모델 로드 실패", model_name.upper())
 
 def log_ensemble_summary(loaded_models, total_models):
     """앙상블 구성 완료 로그"""
-    logger = logging.getLogger(__name__)
-    logger.info(f"🎯 앙상블 구성 완료: {loaded_models}/{total_models} 모델 활성화")
+    logger.info("🎯 앙상블 구성 완료: %d/%d 모델 활성화", loaded_models, total_models)
     if loaded_models == 0:
         logger.warning("⚠️  ML 모델 없음 - 규칙 기반 모델로 대체")
     elif loaded_models < total_models:
-        logger.warning(f"⚠️  일부 모델 누락 - {total_models - loaded_models}개 모델 로드 실패")
+        logger.warning("⚠️  일부 모델 누락 - %d개 모델 로드 실패", total_models - loaded_models)
 
 def log_data_preprocessing(original_data, processed_data, scaler_used=False):
     """데이터 전처리 과정 로그"""
-    logger = logging.getLogger(__name__)
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     logger.debug("🔧 데이터 전처리 수행:")
-    logger.debug(f"  원본 데이터 형태: {original_data.shape if hasattr(original_data, 'shape') else len(original_data)}")
-    logger.debug(f"  전처리 후 형태: {processed_data.shape}")
-    logger.debug(f"  스케일러 사용: {'예' if scaler_used else '아니오'}")
-    logger.debug(f"  전처리된 값 범위: [{processed_data.min():.3f}, {processed_data.max():.3f}]")
+    logger.debug("  원본 데이터 형태: %s", original_data.shape if hasattr(original_data, 'shape') else len(original_data))
+    logger.debug("  전처리 후 형태: %s", processed_data.shape)
+    logger.debug("  스케일러 사용: %s", '예' if scaler_used else '아니오')
+    logger.debug("  전처리된 값 범위: [%.3f, %.3f]", processed_data.min(), processed_data.max())
 
 def log_db_save(table_name, success=True, error=None):
     """DB 저장 결과 로그"""
-    logger = logging.getLogger(__name__)
     if success:
-        logger.debug(f"💾 DB 저장 성공: {table_name} 테이블")  
+        logger.debug("💾 DB 저장 성공: %s 테이블", table_name)
     else:
-        logger.error(f"💾 DB 저장 실패: {table_name} 테이블 - {error}")
+        logger.error("💾 DB 저장 실패: %s 테이블 - %s", table_name, error)
 
 def log_websocket_connection(client_id, action="connected"):
     """WebSocket 연결 상태 로그"""
-    logger = logging.getLogger(__name__)
     if action == "connected":
-        logger.info(f"🔌 클라이언트 연결: {client_id}")
+        logger.info("🔌 클라이언트 연결: %s", client_id)
     elif action == "disconnected":
-        logger.info(f"🔌 클라이언트 연결 해제: {client_id}")
+        logger.info("🔌 클라이언트 연결 해제: %s", client_id)
     elif action == "error":
-        logger.error(f"🔌 클라이언트 연결 오류: {client_id}")
+        logger.error("🔌 클라이언트 연결 오류: %s", client_id)
 
 def log_api_request(endpoint, method="GET", client_ip=None):
     """API 요청 로그"""
-    logger = logging.getLogger(__name__)
-    client_info = f" ({client_ip})" if client_ip else ""
-    logger.info(f"🌐 API 요청: {method} {endpoint}{client_info}")
+    if client_ip:
+        logger.info("🌐 API 요청: %s %s (%s)", method, endpoint, client_ip)
+    else:
+        logger.info("🌐 API 요청: %s %s", method, endpoint)
 
 def log_system_health(cpu_usage=None, memory_usage=None, active_connections=0):
     """시스템 상태 로그"""
-    logger = logging.getLogger(__name__)
-    health_info = f"💓 시스템 상태 - 활성 연결: {active_connections}"
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    health_info = "💓 시스템 상태 - 활성 연결: %s"
+    args = [active_connections]
     if cpu_usage:
-        health_info += f", CPU: {cpu_usage:.1f}%"
+        health_info += ", CPU: %.1f%%"
+        args.append(cpu_usage)
     if memory_usage:
-        health_info += f", 메모리: {memory_usage:.1f}%"
-    logger.info(health_info)
+        health_info += ", 메모리: %.1f%%"
+        args.append(memory_usage)
+    logger.info(health_info, *args)
 
 def log_stage2_prediction_detailed(client_id, device_id, imu_data, stage1_result, prediction_details, processing_time):
     """2차 분류 상세 예측 과정 로그"""
-    logger = logging.getLogger(__name__)
+    if not logger.isEnabledFor(logging.INFO):
+        return
     
     # 헤더
-    logger.info("=" * 50)
-    logger.info(f"🎯 [2차 분류 시작] 클라이언트: {client_id}, 디바이스: {device_id}")
-    logger.info(f"📊 1차 분류 결과: 자세 {stage1_result['prediction']} (신뢰도: {stage1_result['confidence']:.3f})")
+    logger.info(_RULE_50)
+    logger.info("🎯 [2차 분류 시작] 클라이언트: %s, 디바이스: %s", client_id, device_id)
+    logger.info("📊 1차 분류 결과: 자세 %s (신뢰도: %.3f)", stage1_result['prediction'], stage1_result['confidence'])
     
     # IMU 데이터 로그
     if imu_data:
         logger.info("📱 IMU 센서 데이터:")
         if isinstance(imu_data, dict):
-            logger.info(f"   • 가속도: X={imu_data.get('accel_x', 0):.3f}, Y={imu_data.get('accel_y', 0):.3f}, Z={imu_data.get('accel_z', 0):.3f}")
-            logger.info(f"   • 자이로:  X={imu_data.get('gyro_x', 0):.3f}, Y={imu_data.get('gyro_y', 0):.3f}, Z={imu_data.get('gyro_z', 0):.3f}")
+            logger.info("   • 가속도: X=%.3f, Y=%.3f, Z=%.3f",
+                        imu_data.get('accel_x', 0), imu_data.get('accel_y', 0), imu_data.get('accel_z', 0))
+            logger.info("   • 자이로:  X=%.3f, Y=%.3f, Z=%.3f",
+                        imu_data.get('gyro_x', 0), imu_data.get('gyro_y', 0), imu_data.get('gyro_z', 0))
     
     # 개별 2차 모델 결과
     individual_preds = prediction_details.get('stage2_individual_predictions', {})
@@ -221,7 +302,7 @@ def log_stage2_prediction_detailed(client_id, device_id, imu_data, stage1_result
         logger.info("🤖 개별 2차 모델 예측 결과:")
         for model_name, prediction in individual_preds.items():
             confidence = individual_confs.get(model_name, 0.0)
-            logger.info(f"   • {model_name.upper()}: 자세 {prediction} (신뢰도 {confidence:.3f})")
+            logger.info("   • %s: 자세 %s (신뢰도 %.3f)", model_name.upper(), prediction, confidence)
     
     # 투표 점수
     voting_scores = prediction_details.get('stage2_voting_scores', [])
@@ -229,11 +310,11 @@ def log_stage2_prediction_detailed(client_id, device_id, imu_data, stage1_result
         logger.info("🗳️  2차 앙상블 투표 점수:")
         for i, score in enumerate(voting_scores):
             if score > 0.001:  # 의미있는 점수만 표시
-                logger.info(f"   • 자세 {i}: {score:.3f}")
+                logger.info("   • 자세 %d: %.3f", i, score)
     
     # 최종 결과
     final_pred = prediction_details.get('stage2_final_prediction', 0)
     final_conf = prediction_details.get('stage2_final_confidence', 0.0)
-    logger.info(f"✅ 2차 분류 최종 예측: 자세 {final_pred} (신뢰도 {final_conf:.3f})")
-    logger.info(f"⏱️  2차 분류 처리 시간: {processing_time:.1f}ms")
-    logger.info("🏁 [2차 분류 완료] " + "=" * 30)
\ No newline at end of file
+    logger.info("✅ 2차 분류 최종 예측: 자세 %s (신뢰도 %.3f)", final_pred, final_conf)
+    logger.info("⏱️  2차 분류 처리 시간: %.1fms", processing_time)
+    logger.info(_STAGE2_FOOTER)
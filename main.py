@@ -12,6 +12,7 @@ import uvicorn
 import psutil
 from websocket_server import start_websocket_server
 from statistics_api import app as fastapi_app
+from model_predictor import get_predictor, EnsemblePosturePredictor
 from logger_config import setup_logging, log_server_start, log_server_shutdown, log_system_health
 from config import config
 
@@ -27,6 +28,10 @@ def signal_handler(signum, frame):
 
 def run_fastapi_server():
     """FastAPI 서버 실행 (별도 스레드)"""
+    # API 스레드 전용 예측기: 모델은 WebSocket 예측기와 공유하고 작업 버퍼만 분리
+    # (PRELOAD_MODELS=false면 만들지 않음 - API는 필요할 때 get_predictor()로 전역 예측기를 생성)
+    if config.PRELOAD_MODELS:
+        fastapi_app.state.predictor = EnsemblePosturePredictor(share_from=get_predictor())
     try:
         uvicorn.run(
             fastapi_app,
@@ -40,10 +45,12 @@ def run_fastapi_server():
 
 async def system_monitor():
     """시스템 상태 모니터링 (주기적 실행)"""
+    # 첫 호출로 CPU 사용률 기준점을 잡아 두고, 이후에는 이전 호출 대비 값을 즉시 반환받음
+    psutil.cpu_percent(interval=None)
     while True:
         try:
             # 시스템 리소스 정보 수집
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=None)  # 이벤트 루프를 블로킹하지 않음
             memory_info = psutil.virtual_memory()
             memory_percent = memory_info.percent
             
@@ -75,6 +82,10 @@ async def main():
     logger.info("=====================================")
     
     try:
+        # 모델 로드 (예측기는 처음 요청될 때 생성되므로 서버 스레드 시작 전에 메인 스레드에서 준비)
+        if config.PRELOAD_MODELS:
+            get_predictor()
+        
         # FastAPI 서버를 별도 스레드에서 실행
         fastapi_thread = threading.Thread(
             target=run_fastapi_server, 
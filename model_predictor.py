@@ -1,18 +1,347 @@
 import numpy as np
 import logging
+import array
+import asyncio
+import atexit
+import collections
+import concurrent.futures
+import json
+import math
+import zlib
+import queue
+import threading
 from typing import List, Tuple, Dict, Any, Optional
 import os
-import random
 import joblib
-from datetime import datetime
+import time
 from config import config
-from database import PostureDatabase
+from database import PostureDatabase, run_batch_writer
+from logger_config import (
+    log_data_preprocessing, log_prediction_detailed, prediction_log_enabled, log_db_save,
+    log_model_loading, log_model_loaded, log_ensemble_summary
+)
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
+# 모델 파일 디렉터리
+ML_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ML')
+
+# 모델의 큰 배열(KNN 학습 데이터, RF 트리 등)을 힙에 복사하지 않고 읽기 전용 메모리 맵으로 로드
+JOBLIB_MMAP_MODE = 'r'
+
+# 예측 로그 일괄 저장 설정 (저장 스레드가 대기열의 행을 모아 한 트랜잭션에 저장)
+PREDICTION_LOG_MAX_BATCH = 512        # 한 트랜잭션에 저장할 최대 행 수
+PREDICTION_LOG_LINGER = 0.1           # 첫 행 이후 추가 행을 모으는 시간(초) - 압축 저장 모드의 묶음 크기를 키움
+PREDICTION_LOG_STOP_TIMEOUT = 5.0     # 종료 시 남은 로그 저장을 기다리는 시간(초)
+
+# 앙상블 마이크로 배치 설정: 같은 이벤트 루프 틱(또는 대기 시간 내)에 도착한 요청을 한 번에 예측
+ENSEMBLE_MAX_BATCH = 32   # 한 배치의 최대 요청 수
+ENSEMBLE_MAX_WAIT = 0.0   # 배치를 모으기 위해 추가로 기다릴 시간(초), 0이면 현재 틱의 요청만 모음
+
+# 앙상블 예측 캐시: 정지한 사용자의 연속 샘플은 거의 같으므로 하위 비트를 버린 FSR 값이 같으면 이전 결과를 재사용
+PREDICTION_CACHE_SIZE = 4096   # 최대 항목 수 (LRU)
+PREDICTION_CACHE_TTL = 2.0     # 항목 유지 시간(초)
+PREDICTION_CACHE_SHIFT = 3     # 키 생성 시 버리는 하위 비트 수
+
+# 특성 dtype: FSR은 10~12비트 ADC 값이므로 float32로 충분 (메모리 대역폭 절반, 스케일러 통계도 같은 dtype으로 캐시)
+FEATURE_DTYPE = np.float32
+
+# timestamp는 레코드의 예측 시각(Unix 시간)을 CURRENT_TIMESTAMP와 같은 UTC 형식으로 저장
+INSERT_PREDICTION_LOG_SQL = '''
+    INSERT INTO prediction_logs (
+        timestamp, client_id, device_id, fsr_data, imu_data, raw_fsr_values, preprocessed_data,
+        lr_prediction, lr_confidence, rf_prediction, rf_confidence,
+        dt_prediction, dt_confidence, kn_prediction, kn_confidence,
+        ensemble_prediction, ensemble_confidence, voting_scores,
+        models_used, prediction_method, processing_time_ms
+    ) VALUES (datetime(?, 'unixepoch'), ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# 압축 저장 모드(config.PREDICTION_LOG_PACKED): 저장 트랜잭션마다 클라이언트/기기별로 행들을 묶어 BLOB 한 행으로 저장
+PREDICTION_LOG_FIELDS = (
+    'timestamp', 'client_id', 'device_id', 'fsr_data', 'imu_data', 'raw_fsr_values', 'preprocessed_data',
+    'lr_prediction', 'lr_confidence', 'rf_prediction', 'rf_confidence',
+    'dt_prediction', 'dt_confidence', 'kn_prediction', 'kn_confidence',
+    'ensemble_prediction', 'ensemble_confidence', 'voting_scores',
+    'models_used', 'prediction_method', 'processing_time_ms'
+)  # 대기열 레코드와 압축 행(payload) 안의 레코드 필드 순서 (timestamp는 Unix 시간)
+
+INSERT_PACKED_PREDICTION_LOG_SQL = '''
+    INSERT INTO prediction_logs_packed (client_id, device_id, ts_start, ts_end, record_count, payload)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+# 시간대(1시간)별 예측 집계: 저장 스레드가 배치마다 갱신하고 get_prediction_statistics는 이 테이블만 조회
+UPSERT_PREDICTION_STATS_HOURLY_SQL = '''
+    INSERT INTO prediction_stats_hourly (
+        hour_bucket, prediction_method, n, sum_conf, sum_time, lr_agree, rf_agree, dt_agree, kn_agree
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(hour_bucket, prediction_method) DO UPDATE SET
+        n = n + excluded.n,
+        sum_conf = sum_conf + excluded.sum_conf,
+        sum_time = sum_time + excluded.sum_time,
+        lr_agree = lr_agree + excluded.lr_agree,
+        rf_agree = rf_agree + excluded.rf_agree,
+        dt_agree = dt_agree + excluded.dt_agree,
+        kn_agree = kn_agree + excluded.kn_agree
+'''
+
+# 집계 테이블을 처음 만들 때 기존 예측 로그로 한 번 채움
+BACKFILL_PREDICTION_STATS_HOURLY_SQL = '''
+    INSERT INTO prediction_stats_hourly (
+        hour_bucket, prediction_method, n, sum_conf, sum_time, lr_agree, rf_agree, dt_agree, kn_agree
+    )
+    SELECT CAST(strftime('%s', timestamp) AS INTEGER) / 3600 * 3600, prediction_method,
+           COUNT(*), SUM(ensemble_confidence), TOTAL(processing_time_ms),
+           TOTAL(lr_prediction = ensemble_prediction), TOTAL(rf_prediction = ensemble_prediction),
+           TOTAL(dt_prediction = ensemble_prediction), TOTAL(kn_prediction = ensemble_prediction)
+    FROM prediction_logs
+    GROUP BY 1, 2
+'''
+
+SELECT_PREDICTION_STATS_HOURLY_SQL = '''
+    SELECT prediction_method, SUM(n), SUM(sum_conf), SUM(sum_time),
+           SUM(lr_agree), SUM(rf_agree), SUM(dt_agree), SUM(kn_agree)
+    FROM prediction_stats_hourly
+    WHERE hour_bucket >= ?
+    GROUP BY prediction_method
+'''
+
+# 예측 로그 직렬화: orjson이 설치되어 있으면 사용 (NumPy 배열을 tolist 없이 직접 직렬화)
+try:
+    import orjson
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    
+    _dumps_array = _dumps
+except ImportError:  # orjson이 없으면 표준 json 사용
+    def _json_default(obj):
+        """json.dumps가 처리하지 못하는 NumPy 배열/스칼라를 Python 값으로 변환"""
+        if isinstance(obj, (np.ndarray, np.generic)):
+            return obj.tolist()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    
+    def _dumps(obj):
+        return json.dumps(obj, default=_json_default)
+    
+    def _dumps_array(arr):
+        return json.dumps(arr.tolist())
+
+# ONNX Runtime 추론: onnxruntime이 설치되어 있고 ML/model_*.onnx(ML/onnx_export.py로 생성)가 있으면 사용
+try:
+    import onnxruntime as ort
+except ImportError:  # 없으면 sklearn predict_proba 사용
+    ort = None
+
+# 트리 모델 네이티브 추론: tl2cgen이 설치되어 있고 ML/model_rf.so, model_dt.so(ML/treelite_export.py로 생성)가 있으면 사용
+# tl2cgen(treelite 포함)은 임포트만 수십 ms 걸리므로 라이브러리 파일이 있을 때 load_tree_predictors에서 임포트
+tl2cgen = None
+
+def _analyze_fsr_pattern_py(fsr):
+    """규칙 기반 자세 분류 커널 (analyze_fsr_pattern과 동일한 규칙, Numba 컴파일용 스칼라 루프)"""
+    left = 0.0
+    for i in range(5):
+        left += fsr[i]
+    right = 0.0
+    for i in range(5, 11):
+        right += fsr[i]
+    front = fsr[0] + fsr[1] + fsr[5] + fsr[6]
+    back = fsr[3] + fsr[4] + fsr[8] + fsr[9]
+    total = left + right
+    
+    if total == 0:
+        return 0, 0.5
+    
+    if left > right * 1.5:
+        posture = 7 if front > back else 5
+        confidence = min(0.9, (left - right) / max(right, 1e-6) * 0.5 + 0.6)
+    elif right > left * 1.5:
+        posture = 6 if front > back else 4
+        confidence = min(0.9, (right - left) / max(left, 1e-6) * 0.5 + 0.6)
+    elif front > back * 1.3:
+        if max(fsr[0], fsr[1], fsr[2]) * 11 > total * 1.5:
+            posture = 2
+        elif left > right:
+            posture = 1
+        else:
+            posture = 3
+        confidence = min(0.9, (front - back) / max(back, 1e-6) * 0.5 + 0.6)
+    else:
+        posture = 0
+        confidence = min(0.95, 1 - abs(left - right) / total + 0.3)
+    
+    return posture, max(0.3, min(0.95, confidence))
+
+# Numba가 설치되어 있으면 규칙 기반 분류를 컴파일된 커널로 수행 (없으면 NumPy 경로)
+try:
+    from numba import njit
+    _analyze_fsr_pattern_kernel = njit(cache=True)(_analyze_fsr_pattern_py)
+    # 첫 요청이 컴파일 비용을 지불하지 않도록 임포트 시점에 미리 컴파일 (cache=True로 이후 실행은 디스크 캐시 사용)
+    _analyze_fsr_pattern_kernel(np.zeros(11, dtype=FEATURE_DTYPE))
+except ImportError:
+    _analyze_fsr_pattern_kernel = None
+
+def _sql_value(value):
+    """NumPy 스칼라를 sqlite3가 바인딩할 수 있는 Python 값으로 변환"""
+    return value.item() if isinstance(value, np.generic) else value
+
+def _dumps_optional(value):
+    """None은 그대로 두고 나머지는 JSON 문자열로 변환"""
+    return None if value is None else _dumps(value)
+
+def serialize_prediction_logs(records):
+    """대기열의 원본 레코드를 DB 행으로 변환 (저장 스레드에서 호출 - 예측 경로에서는 직렬화하지 않음)
+
+    저장 스레드는 예측 스레드와 GIL을 나눠 쓰므로 열 위치를 고정해 풀어서 값마다 분기하지 않는다.
+    models_used는 로드 시 미리 직렬화한 문자열을 그대로 저장한다.
+    """
+    rows = []
+    for (timestamp, client_id, device_id, fsr_data, imu_data, raw_fsr_values, features,
+         lr_pred, lr_conf, rf_pred, rf_conf, dt_pred, dt_conf, kn_pred, kn_conf,
+         ensemble_pred, ensemble_conf, voting_scores, models_used, method, processing_time) in records:
+        fsr_json = _dumps_optional(fsr_data)
+        # NumPy 스칼라(np.int64 등)는 sqlite3가 바인딩하지 못해 배치 전체가 실패하므로 Python 값으로 변환
+        rows.append((
+            timestamp, client_id, device_id, fsr_json, _dumps_optional(imu_data),
+            fsr_json if raw_fsr_values is fsr_data else _dumps_optional(raw_fsr_values),  # 같은 리스트는 한 번만 직렬화
+            _dumps_array(features),
+            _sql_value(lr_pred), _sql_value(lr_conf), _sql_value(rf_pred), _sql_value(rf_conf),
+            _sql_value(dt_pred), _sql_value(dt_conf), _sql_value(kn_pred), _sql_value(kn_conf),
+            _sql_value(ensemble_pred), _sql_value(ensemble_conf), _dumps_optional(voting_scores),
+            models_used, method, processing_time,
+        ))
+    return rows
+
+def pack_prediction_logs(records):
+    """예측 로그 레코드들을 (client_id, device_id)별 압축 행으로 변환 (저장 스레드에서 호출)"""
+    groups = {}
+    for record in records:
+        groups.setdefault((record[1], record[2]), []).append(record)
+    
+    rows = []
+    for (client_id, device_id), group in groups.items():
+        # NumPy 값이 남아 있어도(직렬화 전 레코드) 표준 json으로 저장되도록 Python 값으로 변환
+        group = [[_dumps_array(value) if isinstance(value, np.ndarray) else _sql_value(value) for value in record]
+                 for record in group]
+        payload = zlib.compress(_dumps(group).encode())
+        timestamps = [record[0] for record in group]
+        rows.append((client_id, device_id, min(timestamps), max(timestamps), len(group), payload))
+    return rows
+
+def update_prediction_stats_hourly(conn, records):
+    """저장 배치의 레코드를 (시간대, 예측 방법)별로 집계해 prediction_stats_hourly에 누적 (저장 스레드에서 호출)"""
+    # 저장 시각이 아니라 레코드의 예측 시각으로 시간대를 정해 정시를 걸친 배치도 올바른 시간대에 집계
+    totals = collections.defaultdict(lambda: [0, 0.0, 0.0, 0, 0, 0, 0])
+    for record in records:
+        (lr_pred, _, rf_pred, _, dt_pred, _, kn_pred, _,
+         ensemble_pred, ensemble_conf) = record[7:17]
+        method, processing_time = record[19], record[20]
+        total = totals[int(record[0]) // 3600 * 3600, method]
+        total[0] += 1
+        total[1] += ensemble_conf
+        total[2] += processing_time or 0
+        total[3] += lr_pred == ensemble_pred
+        total[4] += rf_pred == ensemble_pred
+        total[5] += dt_pred == ensemble_pred
+        total[6] += kn_pred == ensemble_pred
+    conn.executemany(UPSERT_PREDICTION_STATS_HOURLY_SQL,
+                     [(hour_bucket, method, *total) for (hour_bucket, method), total in totals.items()])
+
+def unpack_prediction_logs(payload) -> List[Dict]:
+    """압축 행의 payload를 필드 이름 dict 목록으로 복원"""
+    return [dict(zip(PREDICTION_LOG_FIELDS, record)) for record in json.loads(zlib.decompress(payload))]
+
+class FastStandardScaler:
+    """.npy로 내보낸 StandardScaler 통계만으로 정규화하는 경량 스케일러 (ML/scaler_export.py 참고)
+
+    통계는 FEATURE_DTYPE(float32)으로 보관하므로 float32 입력은 float64로 올라가지 않는다.
+    """
+    
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = np.asarray(mean, dtype=FEATURE_DTYPE)
+        self.scale_ = np.asarray(scale, dtype=FEATURE_DTYPE)
+        self.n_features_in_ = self.mean_.shape[0]
+    
+    @classmethod
+    def from_scaler(cls, scaler) -> 'FastStandardScaler':
+        """학습된 StandardScaler에서 생성 (with_mean/with_std=False면 항등 값 사용)"""
+        n_features = getattr(scaler, 'n_features_in_', 0)
+        mean = getattr(scaler, 'mean_', None)
+        scale = getattr(scaler, 'scale_', None)
+        return cls(np.zeros(n_features) if mean is None else mean,
+                   np.ones(n_features) if scale is None else scale)
+    
+    def transform(self, X: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """out이 주어지면 결과를 그 배열에 제자리 기록 (호출마다 임시 배열 생성 없음)"""
+        if out is None:
+            return (X - self.mean_) / self.scale_
+        np.subtract(X, self.mean_, out=out)
+        return np.divide(out, self.scale_, out=out)
+
+def load_npy_scaler(ml_dir: str, scaler_name: str) -> Optional[FastStandardScaler]:
+    """<scaler_name>_mean.npy / _scale.npy가 있으면 pickle 없이 스케일러 생성 (없으면 None)"""
+    try:
+        mean = np.load(os.path.join(ml_dir, f'{scaler_name}_mean.npy'), mmap_mode=JOBLIB_MMAP_MODE)
+        scale = np.load(os.path.join(ml_dir, f'{scaler_name}_scale.npy'), mmap_mode=JOBLIB_MMAP_MODE)
+    except FileNotFoundError:
+        return None
+    return FastStandardScaler(mean, scale)
+
+class EnsembleMicroBatcher:
+    """동시에 도착한 예측 요청을 모아 앙상블 모델을 (B, 11) 배치로 한 번만 호출 (이벤트 루프 스레드 전용)"""
+    
+    def __init__(self, predictor, max_batch=ENSEMBLE_MAX_BATCH, max_wait=ENSEMBLE_MAX_WAIT):
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending = []
+        self._handle = None
+    
+    def submit(self, features: np.ndarray) -> asyncio.Future:
+        """특성 벡터를 배치에 추가하고 (자세, 신뢰도, 상세 정보)를 받을 Future 반환"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((features, future))
+        
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._handle is None:
+            if self.max_wait > 0:
+                self._handle = loop.call_later(self.max_wait, self._flush)
+            else:
+                self._handle = loop.call_soon(self._flush)
+        return future
+    
+    def _flush(self):
+        """대기 중인 요청을 한 번의 배치 예측으로 처리"""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        
+        try:
+            results = self.predictor.ensemble_predict_batch(
+                np.stack([features for features, _ in pending]),
+                collect_details=self.predictor.needs_prediction_details())
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
 class EnsemblePosturePredictor:
-    def __init__(self, model_path=None):
+    EXPECTED_FSR_SIZE = 11  # FSR 센서 개수 (입력 계약)
+    
+    def __init__(self, model_path=None, share_from: Optional['EnsemblePosturePredictor'] = None):
+        """share_from이 주어지면 로드된 모델/스케일러(추론 중 읽기 전용)를 공유하고 작업 버퍼만 새로 할당"""
         self.model_path = model_path or config.MODEL_PATH
         self.models = {}  # 1차 모델들 (FSR 기반)
         self.models_stage2 = {}  # 2차 모델들 (IMU 기반)
@@ -28,11 +357,36 @@ class EnsemblePosturePredictor:
             6: "오른쪽 다리 꼬기",
             7: "왼쪽 다리 꼬기"
         }
+        self._n_postures = len(self.posture_labels)
         self.supports_proba = True
-        # Database manager for logging
-        self.db_manager = PostureDatabase()
-        self.load_ensemble_models()
-        # self.load_stage2_models()  # 2차 모델들 로드 - 임계값 기반으로 변경
+        self._proba_models = set()  # predict_proba를 지원하는 1차 모델 이름
+        self._proba_models_stage2 = set()  # predict_proba를 지원하는 2차 모델 이름 (공유 인스턴스도 보도록 제자리 갱신)
+        self._ordered_models = []  # 투표에 참여하는 (이름, 모델) 목록 - _weight_vec과 같은 순서
+        self._weight_vec = np.empty(0)
+        self._models_json = '[]'  # 예측 로그 models_used 열 값 (모델 구성은 로드 후 바뀌지 않으므로 한 번만 직렬화)
+        self._scaler_mean = None  # StandardScaler.transform 대신 직접 정규화에 쓰는 캐시
+        self._scaler_scale = None
+        self._onnx_sessions = {}  # 모델 이름 -> ONNX Runtime 세션 (확률 예측 대체)
+        self._tree_predictors = {}  # 모델 이름 -> tl2cgen 컴파일 트리 예측기 (rf, dt)
+        self._ensemble_session = None  # 모든 모델의 확률을 한 번에 출력하는 통합 ONNX 세션 (ML/onnx_export.py --ensemble)
+        self._ensemble_models = []  # 통합 세션이 확률을 출력하는 모델 이름 (_ordered_models 순서)
+        self._model_pool = None  # 앙상블 모델을 동시에 실행하는 스레드 풀 (모델 로드 후 생성)
+        self._batcher = None  # predict_posture_async 첫 호출 시 생성
+        self._prediction_cache = collections.OrderedDict()  # 양자화 FSR 키 -> (만료 시각, 1차 분류 결과), 인스턴스(스레드)별
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # 규칙 기반 분석용 FSR 영역 마스크 (행: 왼쪽, 오른쪽, 앞쪽, 뒤쪽)
+        self._fsr_masks = np.zeros((4, 11))
+        self._fsr_masks[0, :5] = 1          # 왼쪽 센서 1-5
+        self._fsr_masks[1, 5:] = 1          # 오른쪽 센서 6-11
+        self._fsr_masks[2, [0, 1, 5, 6]] = 1  # 앞쪽 센서들
+        self._fsr_masks[3, [3, 4, 8, 9]] = 1  # 뒤쪽 센서들
+        # 요청마다 재사용하는 특성 버퍼 (스레드 안전하지 않으므로 스레드마다 별도 인스턴스 사용, share_from 참고)
+        self._feat_buf = np.empty((1, 11), dtype=FEATURE_DTYPE)
+        self._feat_view = self._feat_buf[0]
+        self._scaled_buf = np.empty((1, 11), dtype=FEATURE_DTYPE)  # 단일 샘플 정규화 결과 버퍼
+        self._votes_buf = None  # 단일 샘플 (모델, 1, 자세) 투표 버퍼 (첫 예측 시 모델 수에 맞춰 할당)
+        self._imu_buf = np.empty((1, 6), dtype=FEATURE_DTYPE)  # 2차 분류 단일 샘플 IMU 입력/정규화 버퍼
         
         # 모델별 가중치 (성능에 따라 조정 가능)
         self.model_weights = {
@@ -42,14 +396,62 @@ class EnsemblePosturePredictor:
             'kn': 0.15    # K-Nearest Neighbors
         }
         
+        if share_from is not None:
+            # 다른 스레드용 인스턴스: 모델 재로드/테이블 생성 없이 공유
+            self.db_manager = share_from.db_manager
+            self.models = share_from.models
+            self.models_stage2 = share_from.models_stage2
+            self.scaler = share_from.scaler
+            self.scaler_stage2 = share_from.scaler_stage2
+            self.model_weights = share_from.model_weights
+            self._proba_models = share_from._proba_models
+            self._proba_models_stage2 = share_from._proba_models_stage2
+            self._ordered_models = share_from._ordered_models
+            self._weight_vec = share_from._weight_vec
+            self._models_json = share_from._models_json
+            self._scaler_mean = share_from._scaler_mean
+            self._scaler_scale = share_from._scaler_scale
+            self._onnx_sessions = share_from._onnx_sessions
+            self._tree_predictors = share_from._tree_predictors
+            self._ensemble_session = share_from._ensemble_session
+            self._ensemble_models = share_from._ensemble_models
+            self._model_pool = share_from._model_pool
+            if hasattr(share_from, 'classification_rules'):
+                self.classification_rules = share_from.classification_rules
+            # 예측 로그 대기열과 저장 스레드도 공유
+            self._log_queue = share_from._log_queue
+            return
+        
+        # Database manager for logging
+        self.db_manager = PostureDatabase()
+        
+        # 예측 로그 저장 스레드: 예측 경로는 대기열에 넣기만 하고 직렬화와 커밋(fsync)은 전용 연결을 가진 스레드가 수행
+        # (sqlite3는 쿼리/커밋 중 GIL을 해제하므로 예측 스레드를 막지 않음)
+        self._log_queue = queue.Queue()
+        self._log_writer = threading.Thread(
+            target=run_batch_writer,
+            args=(self._log_queue, self.db_manager.db_path,
+                  INSERT_PACKED_PREDICTION_LOG_SQL if config.PREDICTION_LOG_PACKED else INSERT_PREDICTION_LOG_SQL,
+                  PREDICTION_LOG_MAX_BATCH,
+                  pack_prediction_logs if config.PREDICTION_LOG_PACKED else None,
+                  PREDICTION_LOG_LINGER, update_prediction_stats_hourly, serialize_prediction_logs),
+            name="prediction-log-writer", daemon=True)
+        self._log_writer.start()
+        atexit.register(self.stop_prediction_log_writer)
+        
+        self.load_ensemble_models()
+        if len(self._ordered_models) > 1:
+            # sklearn/ONNX 추론은 대부분 GIL을 해제하므로 모델별 스레드로 실행하면 지연 시간이 가장 느린 모델 수준으로 줄어듦
+            self._model_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(self._ordered_models), thread_name_prefix="ensemble-model")
+        # self.load_stage2_models()  # 2차 모델들 로드 - 임계값 기반으로 변경
+        
         # 예측 로그를 위한 DB 테이블 생성
         self.create_prediction_log_table()
 
     def load_stage2_models(self):
         """2차 분류용 IMU 기반 모델들 로드"""
-        from logger_config import log_model_loading, log_model_loaded, log_ensemble_summary
-        
-        ml_dir = os.path.join(os.path.dirname(__file__), 'ML')
+        ml_dir = ML_DIR
         stage2_model_files = {
             'lr2': 'model_lr2.joblib',
             'rf2': 'model_rf2.joblib', 
@@ -63,8 +465,14 @@ class EnsemblePosturePredictor:
         
         # 2차 스케일러 로드
         try:
-            if os.path.exists(scaler2_path):
-                self.scaler_stage2 = joblib.load(scaler2_path)
+            npy_scaler = load_npy_scaler(ml_dir, 'scaler2')
+            if npy_scaler is not None:
+                self.scaler_stage2 = npy_scaler
+                logger.info("✅ 2차 스케일러 로드 성공 (.npy)")
+            elif os.path.exists(scaler2_path):
+                # 정규화 통계만 float32로 보관 (sklearn transform의 검증과 float64 변환 생략)
+                self.scaler_stage2 = FastStandardScaler.from_scaler(
+                    joblib.load(scaler2_path, mmap_mode=JOBLIB_MMAP_MODE))
                 logger.info("✅ 2차 스케일러 로드 성공")
             else:
                 logger.warning("⚠️ 2차 스케일러 파일을 찾을 수 없습니다")
@@ -77,7 +485,7 @@ class EnsemblePosturePredictor:
             model_path = os.path.join(ml_dir, filename)
             try:
                 if os.path.exists(model_path):
-                    model = joblib.load(model_path)
+                    model = joblib.load(model_path, mmap_mode=JOBLIB_MMAP_MODE)
                     self.models_stage2[model_name] = model
                     loaded_stage2_models.append(model_name.upper())
                     logger.info(f"✅ {model_name.upper()} 2차 모델 로드 성공")
@@ -86,6 +494,10 @@ class EnsemblePosturePredictor:
             except Exception as e:
                 logger.error(f"❌ {model_name.upper()} 2차 모델 로드 실패: {e}")
 
+        self._proba_models_stage2.clear()
+        self._proba_models_stage2.update(
+            name for name, model in self.models_stage2.items() if hasattr(model, 'predict_proba'))
+        
         if self.models_stage2:
             logger.info(f"🎯 2차 분류 모델 로드 완료: {loaded_stage2_models}")
         else:
@@ -128,6 +540,46 @@ class EnsemblePosturePredictor:
                         processing_time_ms REAL
                     )
                 ''')
+                # 최근 로그 조회(/statistics/prediction/logs)의 기간 조건과 최신순 정렬용
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_prediction_logs_ts
+                    ON prediction_logs (timestamp)
+                ''')
+                if config.PREDICTION_LOG_PACKED:
+                    cursor.execute('''
+                        CREATE TABLE IF NOT EXISTS prediction_logs_packed (
+                            batch_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            client_id TEXT,
+                            device_id TEXT,
+                            ts_start REAL NOT NULL,
+                            ts_end REAL NOT NULL,
+                            record_count INTEGER NOT NULL,
+                            payload BLOB NOT NULL
+                        )
+                    ''')
+                    cursor.execute('''
+                        CREATE INDEX IF NOT EXISTS idx_prediction_logs_packed_ts
+                        ON prediction_logs_packed (ts_end, client_id)
+                    ''')
+                stats_table_exists = cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'prediction_stats_hourly'"
+                ).fetchone()
+                if not stats_table_exists:
+                    cursor.execute('''
+                        CREATE TABLE prediction_stats_hourly (
+                            hour_bucket INTEGER NOT NULL,  -- 시간대 시작 (Unix 시간, 3600초 단위)
+                            prediction_method TEXT NOT NULL,
+                            n INTEGER NOT NULL,
+                            sum_conf REAL NOT NULL,
+                            sum_time REAL NOT NULL,
+                            lr_agree INTEGER NOT NULL,
+                            rf_agree INTEGER NOT NULL,
+                            dt_agree INTEGER NOT NULL,
+                            kn_agree INTEGER NOT NULL,
+                            PRIMARY KEY (hour_bucket, prediction_method)
+                        )
+                    ''')
+                    cursor.execute(BACKFILL_PREDICTION_STATS_HOURLY_SQL)
                 conn.commit()
                 logger.info("예측 로그 테이블 생성 완료")
         except Exception as e:
@@ -135,9 +587,7 @@ class EnsemblePosturePredictor:
 
     def load_ensemble_models(self):
         """여러 ML 모델들을 로드하여 앙상블 구성"""
-        from logger_config import log_model_loading, log_model_loaded, log_ensemble_summary
-        
-        ml_dir = os.path.join(os.path.dirname(__file__), 'ML')
+        ml_dir = ML_DIR
         model_files = {
             'lr': 'model_lr.joblib',
             'rf': 'model_rf.joblib', 
@@ -149,46 +599,151 @@ class EnsemblePosturePredictor:
         
         log_model_loading()
         
+        # 스케일러와 모델 파일을 동시에 로드 (시작 시간 = 가장 느린 파일 로드 시간)
+        # 존재 여부는 따로 확인하지 않고 joblib.load의 FileNotFoundError로 판단
+        # 언피클링이 필요로 하는 sklearn 모듈을 먼저 임포트 (여러 스레드가 같은 패키지를 동시에 처음 임포트하면
+        # 순환 임포트/교착 감지 오류가 날 수 있으므로 스레드에서는 이미 로드된 클래스로 데이터만 복원)
+        import sklearn.ensemble
+        import sklearn.linear_model
+        import sklearn.neighbors
+        import sklearn.preprocessing
+        import sklearn.tree
+        # 스케일러 통계를 .npy로 내보내 두었으면 joblib 대신 np.load로 읽음
+        npy_scaler = load_npy_scaler(ml_dir, 'scaler')
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(model_files) + 1) as executor:
+            if npy_scaler is None:
+                scaler_future = executor.submit(joblib.load, scaler_path, mmap_mode=JOBLIB_MMAP_MODE)
+            else:
+                scaler_future = concurrent.futures.Future()
+                scaler_future.set_result(npy_scaler)
+            model_futures = {
+                model_name: executor.submit(joblib.load, os.path.join(ml_dir, model_file), mmap_mode=JOBLIB_MMAP_MODE)
+                for model_name, model_file in model_files.items()
+            }
+        
         # 스케일러 로드
         try:
-            if os.path.exists(scaler_path):
-                self.scaler = joblib.load(scaler_path)
-                log_model_loaded("Scaler", True)
-            else:
-                logger.warning("⚠️ 스케일러 파일을 찾을 수 없습니다")
-                log_model_loaded("Scaler", False)
+            self.scaler = scaler_future.result()
+            log_model_loaded("Scaler", True)
+        except FileNotFoundError:
+            logger.warning("⚠️ 스케일러 파일을 찾을 수 없습니다 - 정규화 없이 예측합니다")
+            log_model_loaded("Scaler", False)
         except Exception as e:
-            logger.error(f"스케일러 로드 오류: {e}")
+            logger.error(f"스케일러 로드 오류: {e} - 정규화 없이 예측합니다")
             log_model_loaded("Scaler", False)
         
         # 각 모델 로드
         loaded_models = 0
         total_models = len(model_files)
         
-        for model_name, model_file in model_files.items():
-            model_path = os.path.join(ml_dir, model_file)
+        for model_name, future in model_futures.items():
             try:
-                if os.path.exists(model_path):
-                    model = joblib.load(model_path)
-                    self.models[model_name] = model
-                    loaded_models += 1
-                    log_model_loaded(model_name, True)
-                else:
-                    logger.warning(f"⚠️ {model_name.upper()} 모델 파일을 찾을 수 없습니다: {model_path}")
-                    log_model_loaded(model_name, False)
+                self.models[model_name] = future.result()
+                loaded_models += 1
+                log_model_loaded(model_name, True)
+            except FileNotFoundError:
+                logger.warning(f"⚠️ {model_name.upper()} 모델 파일을 찾을 수 없습니다: {os.path.join(ml_dir, model_files[model_name])}")
+                log_model_loaded(model_name, False)
             except Exception as e:
                 logger.error(f"❌ {model_name.upper()} 모델 로드 오류: {e}")
                 log_model_loaded(model_name, False)
         
+        # 확률 예측 지원 여부는 로드 시 한 번만 확인
+        self._proba_models = {name for name, model in self.models.items() if hasattr(model, 'predict_proba')}
+        self._build_ensemble_cache()
+        self.load_onnx_sessions(ml_dir)
+        self.load_tree_predictors(ml_dir)
+        
         # 앙상블 구성 완료 로그
         log_ensemble_summary(loaded_models, total_models)
         
         if loaded_models == 0:
             logger.warning("사용 가능한 ML 모델이 없어 규칙 기반 모델로 대체합니다")
             self.create_simple_rule_based_model()
+        
+        self._models_json = _dumps(list(self.models))
             
         return loaded_models > 0
 
+    def _build_ensemble_cache(self):
+        """추론 경로에서 쓰는 가중치 벡터와 스케일러 통계를 로드 시 한 번만 계산"""
+        self._ordered_models = [(name, model) for name, model in self.models.items() if name != "rule_based"]
+        self._weight_vec = np.array([self.model_weights.get(name, 1.0) for name, _ in self._ordered_models])
+        
+        self._scaler_mean = self._scaler_scale = None
+        if self.scaler is not None:
+            n_features = getattr(self.scaler, 'n_features_in_', 11)
+            mean = getattr(self.scaler, 'mean_', None)
+            scale = getattr(self.scaler, 'scale_', None)
+            self._scaler_mean = np.zeros(n_features, dtype=FEATURE_DTYPE) if mean is None else np.asarray(mean, dtype=FEATURE_DTYPE)
+            self._scaler_scale = np.ones(n_features, dtype=FEATURE_DTYPE) if scale is None else np.asarray(scale, dtype=FEATURE_DTYPE)
+
+    def load_onnx_sessions(self, ml_dir: str):
+        """내보낸 ONNX 모델이 있으면 ONNX Runtime 세션 생성 (sklearn 모델은 classes_ 조회와 대체 경로로 유지)"""
+        self._onnx_sessions = {}
+        if ort is None:
+            return
+        
+        sess_options = ort.SessionOptions()
+        sess_options.intra_op_num_threads = 1
+        sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        
+        for model_name in self._proba_models:
+            onnx_path = os.path.join(ml_dir, f'model_{model_name}.onnx')
+            if not os.path.exists(onnx_path):
+                continue
+            try:
+                self._onnx_sessions[model_name] = ort.InferenceSession(
+                    onnx_path, sess_options, providers=['CPUExecutionProvider'])
+            except Exception as e:
+                logger.error(f"{model_name.upper()} ONNX 세션 생성 오류: {e} - sklearn 모델로 예측합니다")
+        
+        if self._onnx_sessions:
+            logger.info(f"ONNX Runtime 추론 사용: {', '.join(sorted(self._onnx_sessions))}")
+        
+        # 여러 모델을 입력 하나로 묶어 모델별 확률({이름}_probabilities)을 출력하는 그래프 (onnx_export.py --ensemble로 생성)
+        self._ensemble_session = None
+        self._ensemble_models = []
+        ensemble_path = os.path.join(ml_dir, 'model_ensemble.onnx')
+        if os.path.exists(ensemble_path):
+            try:
+                session = ort.InferenceSession(ensemble_path, sess_options, providers=['CPUExecutionProvider'])
+                output_names = {output.name for output in session.get_outputs()}
+                self._ensemble_models = [model_name for model_name, _ in self._ordered_models
+                                         if model_name in self._proba_models and f'{model_name}_probabilities' in output_names]
+                if self._ensemble_models:
+                    self._ensemble_session = session
+                    logger.info(f"ONNX 통합 앙상블 그래프 사용: {', '.join(self._ensemble_models)}")
+                else:
+                    logger.error("통합 앙상블 ONNX 그래프에 모델별 확률 출력이 없음 - onnx_export.py --ensemble로 다시 생성하세요")
+            except Exception as e:
+                logger.error(f"통합 앙상블 ONNX 세션 생성 오류: {e} - 모델별 예측을 사용합니다")
+
+    def load_tree_predictors(self, ml_dir: str):
+        """컴파일된 트리 모델 라이브러리가 있으면 tl2cgen 예측기 로드 (ONNX 세션보다 우선 사용)"""
+        global tl2cgen
+        self._tree_predictors = {}
+        lib_paths = {}
+        for model_name in ('rf', 'dt'):
+            lib_path = os.path.join(ml_dir, f'model_{model_name}.so')
+            if model_name in self._proba_models and os.path.exists(lib_path):
+                lib_paths[model_name] = lib_path
+        if not lib_paths:
+            return
+        try:
+            import tl2cgen
+        except ImportError:  # 없으면 ONNX Runtime 또는 sklearn 사용
+            return
+        
+        for model_name, lib_path in lib_paths.items():
+            try:
+                self._tree_predictors[model_name] = tl2cgen.Predictor(lib_path, nthread=1)
+            except Exception as e:
+                logger.error(f"{model_name.upper()} 컴파일 트리 모델 로드 오류: {e}")
+        
+        if self._tree_predictors:
+            logger.info(f"컴파일된 트리 모델 사용: {', '.join(sorted(self._tree_predictors))}")
+
     def create_simple_rule_based_model(self):
         """간단한 규칙 기반 모델 생성 (ML 모델 로드가 실패할 경우 사용)"""
         logger.info("규칙 기반 자세 분류 모델을 생성합니다")
@@ -211,29 +766,32 @@ class EnsemblePosturePredictor:
     
     def preprocess_data(self, fsr_data: np.ndarray) -> np.ndarray:
         """입력 데이터 전처리"""
-        from logger_config import log_data_preprocessing
-        
+        # 빠른 경로: 정상 입력(센서 11개 리스트)은 검증/패딩/로그 없이 버퍼에 바로 기록
+        if type(fsr_data) is list and len(fsr_data) == self.EXPECTED_FSR_SIZE:
+            self._feat_view[:] = fsr_data
+            return self._feat_view
+        return self._preprocess_slow(fsr_data)
+    
+    def _preprocess_slow(self, fsr_data) -> np.ndarray:
+        """비정상 입력 전처리 (타입 검증, 크기 불일치 시 패딩/자르기, 상세 로그)"""
         try:
             # FSR 데이터 검증
             if not isinstance(fsr_data, list):
                 raise ValueError("FSR 데이터는 리스트 형태여야 합니다")
             
-            # FSR 데이터를 numpy 배열로 변환
-            fsr_array = np.array(fsr_data, dtype=float)
-            
             # 데이터 크기 확인 (11개 센서 예상)
-            expected_fsr_size = 11
-            if len(fsr_array) != expected_fsr_size:
-                logger.warning(f"예상 FSR 센서 개수와 다릅니다. 예상: {expected_fsr_size}, 실제: {len(fsr_array)}")
-                # 부족한 경우 0으로 패딩, 많은 경우 자르기
-                if len(fsr_array) < expected_fsr_size:
-                    fsr_array = np.pad(fsr_array, (0, expected_fsr_size - len(fsr_array)), mode='constant')
-                else:
-                    fsr_array = fsr_array[:expected_fsr_size]
+            expected_fsr_size = self.EXPECTED_FSR_SIZE
+            if len(fsr_data) != expected_fsr_size:
+                logger.warning(f"예상 FSR 센서 개수와 다릅니다. 예상: {expected_fsr_size}, 실제: {len(fsr_data)}")
+            
+            # 미리 할당한 버퍼에 기록 (부족한 경우 0으로 패딩, 많은 경우 자르기)
+            n = min(len(fsr_data), expected_fsr_size)
+            fsr_array = self._feat_view
+            fsr_array[:n] = fsr_data[:n]
+            fsr_array[n:] = 0.0
             
             # FSR 특성만 사용 (IMU는 별도 후처리에서 활용)
             features = fsr_array
-            logger.debug(f"FSR 특성: {len(features)}개")
             
             # 상세 전처리 로그 (DEBUG 레벨)
             log_data_preprocessing(fsr_data, features, scaler_used=self.scaler is not None)
@@ -249,7 +807,7 @@ class EnsemblePosturePredictor:
         try:
             if not imu_data:
                 logger.warning("IMU 데이터가 없습니다")
-                return np.zeros(6)  # 기본값: accel_x,y,z + gyro_x,y,z
+                return np.zeros(6, dtype=FEATURE_DTYPE)  # 기본값: accel_x,y,z + gyro_x,y,z
             
             # IMU 데이터에서 특성 추출 (폰 형식: accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z)
             if isinstance(imu_data, dict):
@@ -261,42 +819,38 @@ class EnsemblePosturePredictor:
                 gyro_z = float(imu_data.get('gyro_z', 0.0))
                 
                 features = np.array([accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z], dtype=np.float32)
-                logger.debug(f"IMU 특성 추출: accel({accel_x:.2f}, {accel_y:.2f}, {accel_z:.2f}), gyro({gyro_x:.2f}, {gyro_y:.2f}, {gyro_z:.2f})")
+                logger.debug("IMU 특성 추출: accel(%.2f, %.2f, %.2f), gyro(%.2f, %.2f, %.2f)",
+                             accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z)
                 
             elif isinstance(imu_data, (list, tuple)) and len(imu_data) >= 6:
                 features = np.array(imu_data[:6], dtype=np.float32)
-                logger.debug(f"IMU 배열 데이터 사용: {features}")
+                logger.debug("IMU 배열 데이터 사용: %s", features)
                 
             else:
                 logger.warning(f"예상하지 못한 IMU 데이터 형식: {type(imu_data)}")
-                return np.zeros(6)
+                return np.zeros(6, dtype=FEATURE_DTYPE)
             
             return features
             
         except Exception as e:
             logger.error(f"IMU 데이터 전처리 오류: {e}")
-            return np.zeros(6)
+            return np.zeros(6, dtype=FEATURE_DTYPE)
 
     def analyze_fsr_pattern(self, fsr_data: np.ndarray) -> Tuple[int, float]:
         """FSR 데이터 패턴 분석을 통한 자세 분류"""
+        if _analyze_fsr_pattern_kernel is not None:
+            return _analyze_fsr_pattern_kernel(fsr_data)
+        
         try:
-            # 전체 압력 합계
-            total_pressure = np.sum(fsr_data)
+            # 좌우/앞뒤 영역별 압력 합계를 한 번의 행렬곱으로 계산
+            # (센서 1-5: 왼쪽, 센서 6-11: 오른쪽 가정, 앞뒤는 센서 배치에 따라 조정 필요)
+            # 이후 계산은 NumPy 스칼라보다 빠른 Python float로 수행
+            left_pressure, right_pressure, front_pressure, back_pressure = (self._fsr_masks @ fsr_data).tolist()
+            total_pressure = left_pressure + right_pressure
             
             if total_pressure == 0:
                 return 0, 0.5  # 압력이 없으면 기본 자세
             
-            # 각 센서별 비율 계산
-            ratios = fsr_data / total_pressure
-            
-            # 좌우 균형 분석 (센서 1-5: 왼쪽, 센서 6-11: 오른쪽 가정)
-            left_pressure = np.sum(fsr_data[:5])
-            right_pressure = np.sum(fsr_data[5:])
-            
-            # 앞뒤 균형 분석 (센서 배치에 따라 조정 필요)
-            front_pressure = np.sum(fsr_data[[0, 1, 5, 6]])  # 앞쪽 센서들
-            back_pressure = np.sum(fsr_data[[3, 4, 8, 9]])   # 뒤쪽 센서들
-            
             # 분류 로직 (새로운 자세 분류에 맞게 조정)
             if left_pressure > right_pressure * 1.5:
                 # 왼쪽으로 치우침
@@ -304,7 +858,7 @@ class EnsemblePosturePredictor:
                     predicted_posture = 7  # 왼쪽 다리 꼬기
                 else:
                     predicted_posture = 5  # 왼쪽으로 기대기
-                confidence = min(0.9, (left_pressure / right_pressure - 1) * 0.5 + 0.6)
+                confidence = min(0.9, (left_pressure - right_pressure) / max(right_pressure, 1e-6) * 0.5 + 0.6)
                 
             elif right_pressure > left_pressure * 1.5:
                 # 오른쪽으로 치우침
@@ -312,17 +866,18 @@ class EnsemblePosturePredictor:
                     predicted_posture = 6  # 오른쪽 다리 꼬기
                 else:
                     predicted_posture = 4  # 오른쪽으로 기대기
-                confidence = min(0.9, (right_pressure / left_pressure - 1) * 0.5 + 0.6)
+                confidence = min(0.9, (right_pressure - left_pressure) / max(left_pressure, 1e-6) * 0.5 + 0.6)
                 
             elif front_pressure > back_pressure * 1.3:
                 # 앞쪽으로 치우침
-                if np.max(fsr_data[:3]) > np.mean(fsr_data) * 1.5:
+                # 나눗셈 없이 비교: max(앞 3개) > 평균 * 1.5, 왼쪽 평균 > 오른쪽 평균 * 1.2 (= 왼쪽 합 > 오른쪽 합)
+                if max(fsr_data[:3].tolist()) * 11 > total_pressure * 1.5:
                     predicted_posture = 2  # 목 숙이기
-                elif np.mean(fsr_data[:5]) > np.mean(fsr_data[5:]) * 1.2:
+                elif left_pressure > right_pressure:
                     predicted_posture = 1  # 거북목 자세
                 else:
                     predicted_posture = 3  # 앞으로 당겨 기대기
-                confidence = min(0.9, (front_pressure / back_pressure - 1) * 0.5 + 0.6)
+                confidence = min(0.9, (front_pressure - back_pressure) / max(back_pressure, 1e-6) * 0.5 + 0.6)
                 
             else:
                 # 균형잡힌 자세
@@ -339,87 +894,174 @@ class EnsemblePosturePredictor:
             logger.error(f"패턴 분석 오류: {e}")
             return 0, 0.5
     
+    def predict_stage1(self, features: np.ndarray) -> Tuple[int, float, Dict, str]:
+        """1차 분류 수행 (ML 모델 오류 시 규칙 기반 분류로 대체)"""
+        if len(self.models) > 1 and "rule_based" not in self.models:
+            try:
+                predicted_posture, confidence, prediction_details = self.ensemble_predict(
+                    features, collect_details=self.needs_prediction_details())
+                return predicted_posture, confidence, prediction_details, "ensemble_stage1"
+            except Exception as e:
+                logger.error(f"앙상블 예측 오류, 규칙 기반으로 대체: {e}")
+        
+        return self.rule_based_stage1(features)
+    
+    def rule_based_stage1(self, features: np.ndarray) -> Tuple[int, float, Dict, str]:
+        """규칙 기반 1차 분류 수행"""
+        predicted_posture, confidence = self.analyze_fsr_pattern(features)
+        prediction_details = {
+            "rule_based": {"prediction": predicted_posture, "confidence": confidence}
+        }
+        return predicted_posture, confidence, prediction_details, "rule_based_stage1"
+    
+    def _cache_key(self, features: np.ndarray) -> bytes:
+        """전처리된 FSR 값의 하위 비트를 버려 캐시 키 생성"""
+        return (features.astype(np.int32) >> PREDICTION_CACHE_SHIFT).tobytes()
+    
+    def _cache_get(self, key: bytes) -> Optional[Tuple[int, float, Dict, str]]:
+        """만료되지 않은 캐시된 1차 분류 결과 반환"""
+        entry = self._prediction_cache.get(key)
+        if entry is None:
+            self._cache_misses += 1
+            return None
+        if entry[0] < time.monotonic():
+            del self._prediction_cache[key]
+            self._cache_misses += 1
+            return None
+        self._prediction_cache.move_to_end(key)
+        self._cache_hits += 1
+        return entry[1]
+    
+    def prediction_cache_info(self) -> Dict[str, int]:
+        """예측 캐시 적중/미스 횟수와 현재 크기 (functools.lru_cache의 cache_info와 같은 항목)"""
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'maxsize': PREDICTION_CACHE_SIZE,
+            'currsize': len(self._prediction_cache),
+        }
+    
+    def _cache_put(self, key: bytes, stage1_result: Tuple[int, float, Dict, str]):
+        """앙상블 1차 분류 결과를 캐시에 저장 (가장 오래 사용하지 않은 항목부터 제거)"""
+        if stage1_result[3] != "ensemble_stage1":
+            return  # 규칙 기반 결과(대체 경로)는 계산이 가벼우므로 캐시하지 않음
+        self._prediction_cache[key] = (time.monotonic() + PREDICTION_CACHE_TTL, stage1_result)
+        self._prediction_cache.move_to_end(key)
+        if len(self._prediction_cache) > PREDICTION_CACHE_SIZE:
+            self._prediction_cache.popitem(last=False)
+    
     def predict_posture(self, fsr_data: List[float], imu_data: Any = None, 
                        client_id: str = None, device_id: str = None) -> Tuple[int, float]:
-        """앙상블 기반 자세 예측 수행"""
-        start_time = datetime.now()
+        """앙상블 기반 자세 예측 수행 (입력 전처리 오류는 호출자에게 전달)"""
+        start_time = time.perf_counter_ns()
         
-        try:
-            # 데이터 전처리
-            features = self.preprocess_data(fsr_data)
+        # 데이터 전처리
+        features = self.preprocess_data(fsr_data)
+        
+        # 1차 분류: FSR 기반 예측 (캐시 적중 시 모델 호출 생략)
+        cache_key = self._cache_key(features)
+        stage1_result = self._cache_get(cache_key)
+        if stage1_result is None:
+            stage1_result = self.predict_stage1(features)
+            self._cache_put(cache_key, stage1_result)
+        
+        return self.finish_prediction(stage1_result, features, fsr_data, imu_data, client_id, device_id, start_time)
+    
+    async def predict_posture_async(self, fsr_data: List[float], imu_data: Any = None, 
+                                    client_id: str = None, device_id: str = None) -> Tuple[int, float]:
+        """predict_posture와 동일하되, 동시에 들어온 요청들의 앙상블 예측을 마이크로 배치로 묶어 수행"""
+        start_time = time.perf_counter_ns()
+        
+        # 데이터 전처리
+        features = self.preprocess_data(fsr_data)
+        
+        # 1차 분류: FSR 기반 예측 (캐시 적중 시 모델 호출 생략, 앙상블은 배치로 처리)
+        cache_key = self._cache_key(features)
+        stage1_result = self._cache_get(cache_key)
+        if stage1_result is None and len(self.models) > 1 and "rule_based" not in self.models:
+            if self._batcher is None:
+                self._batcher = EnsembleMicroBatcher(self)
+            # 전처리 버퍼는 다음 요청이 덮어쓰므로 배치 대기 중에는 복사본 사용
+            features = features.copy()
+            try:
+                predicted_posture, confidence, prediction_details = await self._batcher.submit(features)
+                stage1_result = (predicted_posture, confidence, prediction_details, "ensemble_stage1")
+                self._cache_put(cache_key, stage1_result)
+            except Exception as e:
+                logger.error(f"앙상블 예측 오류, 규칙 기반으로 대체: {e}")
+                stage1_result = self.rule_based_stage1(features)
+        elif stage1_result is None:
+            stage1_result = self.rule_based_stage1(features)
+        
+        return self.finish_prediction(stage1_result, features, fsr_data, imu_data, client_id, device_id, start_time)
+    
+    def finish_prediction(self, stage1_result: Tuple[int, float, Dict, str], features: np.ndarray,
+                          fsr_data: List[float], imu_data: Any, client_id: Optional[str],
+                          device_id: Optional[str], start_time: int) -> Tuple[int, float]:
+        """1차 분류 결과에 2차 임계값 분류를 적용하고 로그를 남긴 뒤 최종 결과 반환"""
+        predicted_posture, confidence, prediction_details, method = stage1_result
+        
+        logger.info("🥇 1차 분류 결과: 자세 %s (신뢰도: %.3f)", predicted_posture, confidence)
+        
+        # 2차 분류: 1차에서 자세 0(정자세)인 경우에만 IMU 기반 임계값 분류
+        if predicted_posture == 0 and imu_data:
+            logger.info("🎯 자세 %s 감지 - 2차 IMU 임계값 분류 시작", predicted_posture)
             
-            # 1차 분류: FSR 기반 예측
-            if len(self.models) > 1 and "rule_based" not in self.models:
-                predicted_posture, confidence, prediction_details = self.ensemble_predict(features)
-                method = "ensemble_stage1"
-            else:
-                # 규칙 기반 분류 수행
-                predicted_posture, confidence = self.analyze_fsr_pattern(features)
-                prediction_details = {
-                    "rule_based": {"prediction": predicted_posture, "confidence": confidence}
-                }
-                method = "rule_based_stage1"
+            stage2_start_time = time.perf_counter_ns()
             
-            logger.info(f"🥇 1차 분류 결과: 자세 {predicted_posture} (신뢰도: {confidence:.3f})")
+            # IMU relativePitch 값 추출
+            relative_pitch = None
+            if isinstance(imu_data, dict):
+                if isinstance(imu_data.get('IMU'), dict) and 'relativePitch' in imu_data['IMU']:
+                    relative_pitch = imu_data['IMU']['relativePitch']
+                elif 'relativePitch' in imu_data:
+                    relative_pitch = imu_data['relativePitch']
             
-            # 2차 분류: 1차에서 자세 0(정자세)인 경우에만 IMU 기반 임계값 분류
-            if predicted_posture == 0 and imu_data:
-                logger.info(f"🎯 자세 {predicted_posture} 감지 - 2차 IMU 임계값 분류 시작")
-                
-                stage2_start_time = datetime.now()
-                
-                # IMU relativePitch 값 추출
-                relative_pitch = None
-                if isinstance(imu_data, dict):
-                    if 'IMU' in imu_data and 'relativePitch' in imu_data['IMU']:
-                        relative_pitch = imu_data['IMU']['relativePitch']
-                    elif 'relativePitch' in imu_data:
-                        relative_pitch = imu_data['relativePitch']
-                
-                # 임계값 기반 자세 분류 (±5도)
-                threshold_posture = 0  # 기본값: 정자세
-                if relative_pitch is not None:
-                    try:
-                        pitch_value = float(relative_pitch)
-                        # ±10도 임계값 초과 시 자세 1(거북목/기울어짐)
-                        if abs(pitch_value) > 10.0:
-                            threshold_posture = 1
-                            logger.info(f"🎯 임계값 초과: relativePitch={pitch_value:.2f}° > ±10° → 자세 1")
-                        else:
-                            logger.info(f"🎯 임계값 범위내: relativePitch={pitch_value:.2f}° ≤ ±10° → 자세 0 유지")
-                    except (ValueError, TypeError):
-                        logger.warning(f"⚠️ relativePitch 값 변환 실패: {relative_pitch}")
-                else:
-                    logger.warning("⚠️ relativePitch 값을 찾을 수 없음")
-                
-                # 2차 분류 처리 시간 계산
-                stage2_processing_time = (datetime.now() - stage2_start_time).total_seconds() * 1000
-                
-                # 2차 분류 결과가 유의미한 경우 (자세 0이 아닌 경우) 결과 업데이트
-                if threshold_posture != 0:
-                    logger.info(f"🎯 2차 임계값 분류로 자세 변경: {predicted_posture} -> {threshold_posture}")
-                    predicted_posture = threshold_posture
-                
-                logger.info(f"⏱️ 2차 임계값 분류 처리 시간: {stage2_processing_time:.2f}ms")
-            elif predicted_posture == 0 and not imu_data:
-                logger.debug("자세 0이지만 IMU 데이터가 없어서 2차 임계값 분류를 수행하지 않습니다")
+            # 임계값 기반 자세 분류 (±5도)
+            threshold_posture = 0  # 기본값: 정자세
+            if relative_pitch is not None:
+                try:
+                    pitch_value = float(relative_pitch)
+                    # ±10도 임계값 초과 시 자세 1(거북목/기울어짐)
+                    if abs(pitch_value) > 10.0:
+                        threshold_posture = 1
+                        logger.info("🎯 임계값 초과: relativePitch=%.2f° > ±10° → 자세 1", pitch_value)
+                    else:
+                        logger.info("🎯 임계값 범위내: relativePitch=%.2f° ≤ ±10° → 자세 0 유지", pitch_value)
+                except (ValueError, TypeError):
+                    logger.warning(f"⚠️ relativePitch 값 변환 실패: {relative_pitch}")
             else:
-                logger.debug(f"1차 분류 결과가 자세 {predicted_posture}이므로 2차 분류를 수행하지 않습니다")
+                logger.warning("⚠️ relativePitch 값을 찾을 수 없음")
             
-            # 유효한 자세 범위 확인
-            if predicted_posture not in self.posture_labels:
-                logger.warning(f"예상하지 못한 자세 번호: {predicted_posture}")
-                predicted_posture = 0  # 기본값으로 정자세 설정
-                confidence = 0.5  # 중간 신뢰도 설정
+            # 2차 분류 처리 시간 계산
+            stage2_processing_time = (time.perf_counter_ns() - stage2_start_time) / 1e6
             
-            # 처리 시간 계산
-            processing_time = (datetime.now() - start_time).total_seconds() * 1000
+            # 2차 분류 결과가 유의미한 경우 (자세 0이 아닌 경우) 결과 업데이트
+            if threshold_posture != 0:
+                logger.info("🎯 2차 임계값 분류로 자세 변경: %s -> %s", predicted_posture, threshold_posture)
+                predicted_posture = threshold_posture
             
-            # 상세 예측 과정 로그 출력
-            from logger_config import log_prediction_detailed
+            logger.info("⏱️ 2차 임계값 분류 처리 시간: %.2fms", stage2_processing_time)
+        elif predicted_posture == 0 and not imu_data:
+            logger.debug("자세 0이지만 IMU 데이터가 없어서 2차 임계값 분류를 수행하지 않습니다")
+        else:
+            logger.debug("1차 분류 결과가 자세 %s이므로 2차 분류를 수행하지 않습니다", predicted_posture)
+        
+        # 유효한 자세 범위 확인
+        if predicted_posture not in self.posture_labels:
+            logger.warning(f"예상하지 못한 자세 번호: {predicted_posture}")
+            predicted_posture = 0  # 기본값으로 정자세 설정
+            confidence = 0.5  # 중간 신뢰도 설정
+        
+        # 처리 시간 계산
+        processing_time = (time.perf_counter_ns() - start_time) / 1e6
+        
+        # 상세 예측 과정 로그 출력 (INFO 비활성 시 호출 생략)
+        if prediction_log_enabled():
             log_prediction_detailed(client_id, device_id, fsr_data, prediction_details, processing_time)
-            
-            # 예측 로그 저장 (비동기적으로)
+        
+        # 예측 로그 저장 (비동기적으로)
+        if config.SAVE_PREDICTIONS:
             self.log_prediction(
                 client_id=client_id,
                 device_id=device_id,
@@ -432,66 +1074,136 @@ class EnsemblePosturePredictor:
                 method=method,
                 processing_time=processing_time
             )
-            
-            return predicted_posture, confidence
-            
-        except Exception as e:
-            logger.error(f"자세 예측 오류: {e}")
-            # 오류 발생 시 랜덤 예측 (데모 목적)
-            predicted_posture = random.randint(0, 7)
-            confidence = random.uniform(0.4, 0.8)
-            logger.info(f"오류로 인한 랜덤 예측 - 자세: {predicted_posture}, 신뢰도: {confidence:.3f}")
-            return predicted_posture, confidence
+        
+        return predicted_posture, confidence
 
-    def ensemble_predict(self, features: np.ndarray) -> Tuple[int, float, Dict]:
-        """앙상블 모델을 사용한 예측"""
-        if self.scaler is not None:
-            # 데이터 정규화 (FSR 11개 특성)
-            features_scaled = self.scaler.transform(features.reshape(1, -1))
+    def needs_prediction_details(self) -> bool:
+        """개별 모델 결과/투표 점수가 필요한지 여부 (예측 로그 저장 또는 상세 로그 출력 시)
+
+        예측 로그는 개별 모델 예측/신뢰도와 투표 점수를 모두 열로 저장하므로(/statistics/prediction/logs에서 조회)
+        SAVE_PREDICTIONS(기본값 켜짐)이면 항상 필요하다. 상세 정보 생략은 SAVE_PREDICTIONS=False이고
+        INFO 로그가 꺼진 배포에서만 적용된다.
+        """
+        return config.SAVE_PREDICTIONS or prediction_log_enabled()
+    
+    def ensemble_predict(self, features: np.ndarray, collect_details: bool = True) -> Tuple[int, float, Dict]:
+        """앙상블 모델을 사용한 예측 (단일 샘플)"""
+        # 특성을 미리 할당한 (1, 11) 버퍼에 두고 그대로 사용 (전처리 버퍼에서 온 특성이면 복사도 생략)
+        if features is self._feat_view:
+            features_2d = self._feat_buf
+        elif features.shape == self._feat_view.shape:
+            np.copyto(self._feat_view, features)
+            features_2d = self._feat_buf
         else:
-            features_scaled = features.reshape(1, -1)
-            logger.warning("스케일러가 없어서 정규화를 수행하지 않습니다")
+            features_2d = features.reshape(1, -1)
+        return self.ensemble_predict_batch(features_2d, collect_details)[0]
+    
+    def _run_model(self, model_name: str, model, features_scaled: np.ndarray, features_f32: Optional[np.ndarray]) -> np.ndarray:
+        """모델 하나의 추론 (확률 지원 모델은 확률 행렬, 그 외는 예측 클래스 배열 반환)"""
+        if model_name in self._proba_models:
+            tree_predictor = self._tree_predictors.get(model_name)
+            if tree_predictor is not None:
+                # 출력 (N, 1, 클래스 수) -> (N, 클래스 수), 열 순서는 classes_와 동일
+                return tree_predictor.predict(tl2cgen.DMatrix(features_f32)).reshape(features_f32.shape[0], -1)
+            session = self._onnx_sessions.get(model_name)
+            if session is not None:
+                return session.run(None, {'X': features_f32})[1]
+            return model.predict_proba(features_scaled)
+        return model.predict(features_scaled)
+    
+    def ensemble_predict_batch(self, features_2d: np.ndarray, collect_details: bool = True) -> List[Tuple[int, float, Dict]]:
+        """앙상블 모델을 사용한 배치 예측 (모델마다 (B, 11) 행렬로 한 번씩만 호출)
+
+        collect_details가 False이면 개별 모델 결과와 투표 점수 없이 최종 예측만 상세 정보에 담는다.
+        """
+        if self._scaler_mean is not None and features_2d.shape == self._scaled_buf.shape:
+            # 단일 샘플은 미리 할당한 버퍼에 제자리 정규화 (요청마다 임시 배열 생성 없음)
+            features_scaled = self._scaled_buf
+            np.subtract(features_2d, self._scaler_mean, out=features_scaled)
+            np.divide(features_scaled, self._scaler_scale, out=features_scaled)
+        elif self._scaler_mean is not None:
+            # 데이터 정규화 (FSR 11개 특성) - StandardScaler.transform의 검증 오버헤드 없이 직접 계산
+            features_scaled = (features_2d - self._scaler_mean) / self._scaler_scale
+        else:
+            features_scaled = features_2d  # 스케일러 부재는 로드 시 한 번만 경고
         
+        batch_size = features_scaled.shape[0]
+        n_postures = self._n_postures
+        rows = np.arange(batch_size)
         predictions = {}
         confidences = {}
-        voting_scores = np.zeros(len(self.posture_labels))  # 실제 자세 개수에 맞춤
+        # 모델별 (B, 자세 개수) 투표 행렬 - 마지막에 가중치 벡터와 한 번에 합산
+        if batch_size == 1:
+            # 단일 샘플은 인스턴스(스레드)별 버퍼를 재사용
+            votes = self._votes_buf
+            if votes is None or votes.shape[0] != len(self._ordered_models):
+                votes = self._votes_buf = np.zeros((len(self._ordered_models), 1, n_postures))
+            else:
+                votes.fill(0)
+        else:
+            votes = np.zeros((len(self._ordered_models), batch_size, n_postures))
+        voted = np.zeros(len(self._ordered_models), dtype=bool)
+        # ONNX/컴파일 트리 입력 (특성이 이미 float32이면 복사 없음)
+        if self._onnx_sessions or self._tree_predictors or self._ensemble_session is not None:
+            features_f32 = features_scaled.astype(np.float32, copy=False)
+        else:
+            features_f32 = None
         
-        logger.debug(f"앙상블 예측 시작 - 자세 개수: {len(self.posture_labels)}")
+        # 모델마다 반복되는 DEBUG 로그는 레벨 확인 한 번으로 인자 계산까지 생략
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("앙상블 예측 시작 - 배치 크기: %d, 자세 개수: %d", batch_size, n_postures)
         
-        # 각 모델별 예측 수행
-        for model_name, model in self.models.items():
-            if model_name == "rule_based":
-                continue
-                
+        # 통합 그래프 한 번 실행으로 그래프에 포함된 모델의 확률 행렬을 얻음 (실패하면 모델별 예측으로 대체)
+        # 그래프에 없는 모델은 스레드 풀에서 동시에 실행 (풀이 없으면 아래에서 순서대로 실행)
+        merged = self._ensemble_models if self._ensemble_session is not None else ()
+        outputs = [None] * len(self._ordered_models)
+        if self._model_pool is not None:
+            for idx, (model_name, model) in enumerate(self._ordered_models):
+                if model_name not in merged:
+                    outputs[idx] = self._model_pool.submit(self._run_model, model_name, model, features_scaled, features_f32)
+        if merged:
             try:
-                # 예측 수행
-                pred = model.predict(features_scaled)[0]
-                predictions[model_name] = pred
-                
-                logger.debug(f"{model_name.upper()} 원시 예측: {pred}")
+                merged_outputs = dict(zip(merged, self._ensemble_session.run(
+                    [f'{model_name}_probabilities' for model_name in merged], {'X': features_f32})))
+                outputs = [merged_outputs.get(model_name, output)
+                           for (model_name, _), output in zip(self._ordered_models, outputs)]
+            except Exception as e:
+                logger.error(f"통합 앙상블 ONNX 예측 오류: {e} - 모델별 예측으로 대체")
+        
+        # 각 모델별 예측 결과 집계
+        for idx, (model_name, model) in enumerate(self._ordered_models):
+            try:
+                output = outputs[idx]
+                if isinstance(output, concurrent.futures.Future):
+                    output = output.result()
+                elif output is None:
+                    output = self._run_model(model_name, model, features_scaled, features_f32)
                 
-                # 신뢰도 계산 (확률 예측이 가능한 경우)
-                if hasattr(model, 'predict_proba'):
-                    proba = model.predict_proba(features_scaled)[0]
-                    confidence = np.max(proba)
-                    confidences[model_name] = confidence
+                if model_name in self._proba_models:
+                    # 확률 예측 한 번으로 예측 클래스와 신뢰도를 함께 계산 (predict 중복 호출 방지)
+                    proba = output
+                    best = proba.argmax(axis=1)
+                    predictions[model_name] = model.classes_[best]
+                    confidences[model_name] = proba[rows, best]
                     
-                    # 가중 투표 (확률 기반)
-                    weight = self.model_weights.get(model_name, 1.0)
-                    voting_scores += proba * weight
-                    logger.debug(f"{model_name.upper()} 확률 기반 투표 - 확률: {proba}, 가중치: {weight}")
+                    # 확률 기반 투표 - 확률 열을 모델이 학습한 클래스(자세 번호) 위치에 배치
+                    votes[idx][:, model.classes_] = proba
+                    if debug:
+                        logger.debug("%s 확률 기반 투표 - 확률: %s", model_name.upper(), proba)
                 else:
                     # 단순 투표
-                    confidence = 0.7  # 기본 신뢰도
-                    confidences[model_name] = confidence
-                    weight = self.model_weights.get(model_name, 1.0)
-                    if pred < len(voting_scores):  # 인덱스 범위 확인
-                        voting_scores[pred] += weight
-                        logger.debug(f"{model_name.upper()} 단순 투표 - 자세 {pred}에 가중치 {weight} 추가")
-                    else:
-                        logger.warning(f"{model_name.upper()} 예측 자세 {pred}가 범위를 벗어남 (최대: {len(voting_scores)-1})")
+                    pred = output
+                    predictions[model_name] = pred
+                    confidences[model_name] = np.full(batch_size, 0.7)  # 기본 신뢰도
+                    in_range = pred < n_postures  # 인덱스 범위 확인
+                    votes[idx][rows[in_range], pred[in_range]] = 1.0
+                    if not in_range.all():
+                        logger.warning(f"{model_name.upper()} 예측 자세 {pred[~in_range].tolist()}가 범위를 벗어남 (최대: {n_postures-1})")
+                voted[idx] = True
                     
-                logger.debug(f"{model_name.upper()} 예측: {pred}, 신뢰도: {confidence:.3f}")
+                if debug:
+                    logger.debug("%s 예측: %s, 신뢰도: %s", model_name.upper(), predictions[model_name], confidences[model_name])
                 
             except Exception as e:
                 logger.error(f"{model_name.upper()} 모델 예측 오류: {e}")
@@ -500,97 +1212,142 @@ class EnsemblePosturePredictor:
         if len(predictions) == 0:
             # 모든 모델이 실패한 경우 규칙 기반으로 대체
             logger.warning("모든 ML 모델 예측 실패, 규칙 기반으로 대체")
-            pred, conf = self.analyze_fsr_pattern(features)
-            return pred, conf, {"rule_based_fallback": {"prediction": pred, "confidence": conf}}
+            results = []
+            for features in features_2d:
+                pred, conf = self.analyze_fsr_pattern(features)
+                results.append((pred, conf, {"rule_based_fallback": {"prediction": pred, "confidence": conf}}))
+            return results
         
-        # 투표 점수 디버깅
-        logger.debug(f"최종 투표 점수: {voting_scores}")
-        logger.debug(f"투표 점수 합계: {np.sum(voting_scores)}")
-        
-        # 최종 예측 결정 (가장 높은 점수)
-        if np.sum(voting_scores) > 0:
-            final_prediction = np.argmax(voting_scores)
-            logger.debug(f"투표 기반 최종 예측: {final_prediction} (점수: {voting_scores[final_prediction]})")
+        # 가중 투표: (모델,) @ (모델, B, 자세) -> (B, 자세)
+        if voted.all():
+            voting_scores = np.tensordot(self._weight_vec, votes, axes=1)
         else:
-            # 투표 점수가 모두 0인 경우 - 가장 많이 예측된 자세 선택
-            from collections import Counter
-            if predictions:
-                prediction_counts = Counter(predictions.values())
-                final_prediction = prediction_counts.most_common(1)[0][0]
+            voting_scores = np.tensordot(self._weight_vec[voted], votes[voted], axes=1)
+        if debug:
+            logger.debug("최종 투표 점수: %s", voting_scores)
+        
+        score_sums = voting_scores.sum(axis=1)
+        best_scores = voting_scores.argmax(axis=1)
+        results = []
+        for i in range(batch_size):
+            row_predictions = {name: preds[i] for name, preds in predictions.items()} if collect_details else None
+            
+            # 최종 예측 결정 (가장 높은 점수)
+            if score_sums[i] > 0:
+                final_prediction = best_scores[i]
+                # 앙상블 신뢰도 계산 (정규화된 최대 투표 점수)
+                final_confidence = voting_scores[i, final_prediction] / score_sums[i]
+            else:
+                # 투표 점수가 모두 0인 경우 - 가장 많이 예측된 자세 선택 (동률이면 번호가 작은 자세)
+                row_preds = np.fromiter((preds[i] for preds in predictions.values()), dtype=np.intp, count=len(predictions))
+                final_prediction = int(np.bincount(row_preds, minlength=n_postures).argmax())
                 logger.warning(f"투표 점수가 0이어서 다수결로 선택: {final_prediction}")
+                final_confidence = 0.5
+            
+            # 신뢰도 범위 조정
+            final_confidence = max(0.3, min(0.95, final_confidence))
+            
+            if collect_details:
+                prediction_details = {
+                    'individual_predictions': row_predictions,
+                    'individual_confidences': {name: confs[i] for name, confs in confidences.items()},
+                    'voting_scores': voting_scores[i],  # 리스트 변환(JSON 직렬화)은 저장 스레드에서 배치로 수행
+                    'ensemble_prediction': final_prediction,
+                    'ensemble_confidence': final_confidence
+                }
             else:
-                final_prediction = 0
-                logger.warning("예측 결과가 없어서 기본 자세 0 선택")
-        
-        # 앙상블 신뢰도 계산 (정규화된 최대 투표 점수)
-        if np.sum(voting_scores) > 0:
-            final_confidence = voting_scores[final_prediction] / np.sum(voting_scores)
-        else:
-            final_confidence = 0.5
+                prediction_details = {'ensemble_prediction': final_prediction, 'ensemble_confidence': final_confidence}
+            results.append((final_prediction, final_confidence, prediction_details))
         
-        # 신뢰도 범위 조정
-        final_confidence = max(0.3, min(0.95, final_confidence))
-        
-        logger.debug(f"최종 결정: 자세 {final_prediction}, 신뢰도 {final_confidence:.3f}")
-        
-        prediction_details = {
-            'individual_predictions': predictions,
-            'individual_confidences': confidences,
-            'voting_scores': voting_scores.tolist(),
-            'ensemble_prediction': final_prediction,
-            'ensemble_confidence': final_confidence
-        }
+        if debug:
+            logger.debug("앙상블 예측 완료 - 최종: %s", [result[:2] for result in results])
         
-        logger.debug(f"앙상블 예측 완료 - 최종: {final_prediction}, 신뢰도: {final_confidence:.3f}")
-        
-        return final_prediction, final_confidence, prediction_details
+        return results
 
     def stage2_predict(self, imu_features: np.ndarray) -> Tuple[int, float, Dict]:
         """2차 분류: IMU 데이터 기반 앙상블 예측"""
+        if isinstance(self.scaler_stage2, FastStandardScaler) and np.size(imu_features) == self._imu_buf.size:
+            # 미리 할당한 (1, 6) 버퍼에 복사 후 제자리 정규화
+            self._imu_buf[0] = imu_features
+            self.scaler_stage2.transform(self._imu_buf, out=self._imu_buf)
+            return self.stage2_predict_batch(self._imu_buf, scaled=True)[0]
+        return self.stage2_predict_batch(np.asarray(imu_features).reshape(1, -1))[0]
+    
+    def _run_stage2_model(self, model_name: str, model, imu_scaled: np.ndarray) -> np.ndarray:
+        """2차 모델 하나의 추론 (확률 지원 모델은 확률 행렬, 그 외는 예측 클래스 배열 반환)"""
+        if model_name in self._proba_models_stage2:
+            return model.predict_proba(imu_scaled)
+        return model.predict(imu_scaled)
+    
+    def stage2_predict_batch(self, imu_2d: np.ndarray, scaled: bool = False) -> List[Tuple[int, float, Dict]]:
+        """2차 분류 배치 예측 (스케일러와 모델마다 (B, IMU 특성) 행렬로 한 번씩만 호출)
+
+        scaled가 True이면 imu_2d가 이미 정규화된 것으로 보고 스케일러를 적용하지 않는다.
+        """
+        batch_size = imu_2d.shape[0]
         if not self.models_stage2:
             logger.warning("2차 모델이 로드되지 않았습니다")
-            return 0, 0.5, {"error": "no_stage2_models"}
+            return [(0, 0.5, {"error": "no_stage2_models"})] * batch_size
         
         # IMU 데이터 정규화
-        if self.scaler_stage2 is not None:
-            imu_scaled = self.scaler_stage2.transform(imu_features.reshape(1, -1))
+        if scaled:
+            imu_scaled = imu_2d
+        elif self.scaler_stage2 is not None:
+            imu_scaled = self.scaler_stage2.transform(imu_2d)
         else:
-            imu_scaled = imu_features.reshape(1, -1)
+            imu_scaled = imu_2d
             logger.warning("2차 스케일러가 없어서 정규화를 수행하지 않습니다")
         
+        n_postures = self._n_postures
+        rows = np.arange(batch_size)
         predictions = {}
         confidences = {}
-        voting_scores = np.zeros(len(self.posture_labels))
+        voting_scores = np.zeros((batch_size, n_postures))
         
-        logger.debug(f"2차 예측 시작 - IMU 특성: {imu_features}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("2차 예측 시작 - 배치 크기: %d", batch_size)
         
-        # 각 2차 모델별 예측 수행
-        for model_name, model in self.models_stage2.items():
+        # 2차 모델 추론도 1차 모델과 같은 스레드 풀에서 동시에 실행 (풀이 없으면 순서대로 실행)
+        stage2_models = list(self.models_stage2.items())
+        if self._model_pool is not None and len(stage2_models) > 1:
+            outputs = [self._model_pool.submit(self._run_stage2_model, model_name, model, imu_scaled)
+                       for model_name, model in stage2_models]
+        else:
+            outputs = [None] * len(stage2_models)
+        
+        # 각 2차 모델별 예측 결과 집계 (모델 순서대로 누적해 결과가 실행 순서와 무관)
+        for (model_name, model), output in zip(stage2_models, outputs):
             try:
-                # 예측 수행
-                pred = model.predict(imu_scaled)[0]
-                predictions[model_name] = pred
-                
-                logger.debug(f"{model_name.upper()} 2차 예측: {pred}")
+                if output is not None:
+                    output = output.result()
+                else:
+                    output = self._run_stage2_model(model_name, model, imu_scaled)
                 
-                # 신뢰도 계산
-                if hasattr(model, 'predict_proba'):
-                    proba = model.predict_proba(imu_scaled)[0]
-                    confidence = np.max(proba)
-                    confidences[model_name] = confidence
+                weight = self.model_weights.get(model_name, 1.0)
+                if model_name in self._proba_models_stage2:
+                    # 확률 예측 한 번으로 예측 클래스와 신뢰도를 함께 계산
+                    proba = output
+                    best = proba.argmax(axis=1)
+                    predictions[model_name] = model.classes_[best]
+                    confidences[model_name] = proba[rows, best]
                     
-                    # 가중 투표 (확률 기반)
-                    weight = self.model_weights.get(model_name, 1.0)
-                    voting_scores += proba * weight
-                    logger.debug(f"{model_name.upper()} 2차 확률 투표 - 확률: {proba}, 가중치: {weight}")
+                    # 가중 투표 (확률 기반) - 확률 열을 모델이 학습한 클래스 위치에 배치
+                    voting_scores[:, model.classes_] += proba * weight
+                    if debug:
+                        logger.debug("%s 2차 확률 투표 - 확률: %s, 가중치: %s", model_name.upper(), proba, weight)
                 else:
                     # 단순 투표
-                    confidence = 0.7
-                    confidences[model_name] = confidence
-                    weight = self.model_weights.get(model_name, 1.0)
-                    if pred < len(voting_scores):
-                        voting_scores[pred] += weight
-                        logger.debug(f"{model_name.upper()} 2차 단순 투표 - 자세 {pred}에 가중치 {weight} 추가")
+                    pred = output
+                    predictions[model_name] = pred
+                    confidences[model_name] = np.full(batch_size, 0.7)
+                    in_range = pred < n_postures
+                    voting_scores[rows[in_range], pred[in_range]] += weight
+                    if debug:
+                        logger.debug("%s 2차 단순 투표 - 자세 %s에 가중치 %s 추가", model_name.upper(), pred, weight)
+                
+                if debug:
+                    logger.debug("%s 2차 예측: %s", model_name.upper(), predictions[model_name])
                 
             except Exception as e:
                 logger.error(f"{model_name.upper()} 2차 모델 예측 오류: {e}")
@@ -598,35 +1355,41 @@ class EnsemblePosturePredictor:
         
         if len(predictions) == 0:
             logger.warning("모든 2차 모델 예측 실패")
-            return 0, 0.5, {"error": "all_stage2_models_failed"}
+            return [(0, 0.5, {"error": "all_stage2_models_failed"})] * batch_size
         
         # 2차 분류 최종 예측 결정
-        logger.debug(f"2차 투표 점수: {voting_scores}")
-        
-        if np.sum(voting_scores) > 0:
-            final_prediction = np.argmax(voting_scores)
-            final_confidence = voting_scores[final_prediction] / np.sum(voting_scores)
-        else:
-            # 다수결로 선택
-            from collections import Counter
-            prediction_counts = Counter(predictions.values())
-            final_prediction = prediction_counts.most_common(1)[0][0]
-            final_confidence = 0.6
-        
-        # 신뢰도 범위 조정
-        final_confidence = max(0.3, min(0.95, final_confidence))
-        
-        prediction_details = {
-            'stage2_individual_predictions': predictions,
-            'stage2_individual_confidences': confidences,
-            'stage2_voting_scores': voting_scores.tolist(),
-            'stage2_final_prediction': final_prediction,
-            'stage2_final_confidence': final_confidence
-        }
+        if debug:
+            logger.debug("2차 투표 점수: %s", voting_scores)
         
-        logger.info(f"🎯 2차 분류 완료: 자세 {final_prediction} (신뢰도: {final_confidence:.3f})")
+        score_sums = voting_scores.sum(axis=1)
+        best_scores = voting_scores.argmax(axis=1)
+        results = []
+        for i in range(batch_size):
+            row_predictions = {name: preds[i] for name, preds in predictions.items()}
+            if score_sums[i] > 0:
+                final_prediction = best_scores[i]
+                final_confidence = voting_scores[i, final_prediction] / score_sums[i]
+            else:
+                # 다수결로 선택 (동률이면 번호가 작은 자세)
+                row_preds = np.fromiter(row_predictions.values(), dtype=np.intp, count=len(row_predictions))
+                final_prediction = int(np.bincount(row_preds, minlength=n_postures).argmax())
+                final_confidence = 0.6
+            
+            # 신뢰도 범위 조정
+            final_confidence = max(0.3, min(0.95, final_confidence))
+            
+            prediction_details = {
+                'stage2_individual_predictions': row_predictions,
+                'stage2_individual_confidences': {name: confs[i] for name, confs in confidences.items()},
+                'stage2_voting_scores': voting_scores[i].tolist(),
+                'stage2_final_prediction': final_prediction,
+                'stage2_final_confidence': final_confidence
+            }
+            
+            logger.info("🎯 2차 분류 완료: 자세 %s (신뢰도: %.3f)", final_prediction, final_confidence)
+            results.append((final_prediction, final_confidence, prediction_details))
         
-        return final_prediction, final_confidence, prediction_details
+        return results
     
     def get_posture_label(self, posture_id: int) -> str:
         """자세 ID에 해당하는 라벨 반환"""
@@ -636,103 +1399,69 @@ class EnsemblePosturePredictor:
                       fsr_data: List[float], imu_data: Any, features: np.ndarray,
                       prediction_details: Dict, final_prediction: int, final_confidence: float,
                       method: str, processing_time: float):
-        """예측 결과를 DB에 로그로 저장"""
+        """예측 결과를 DB 저장 대기열에 추가 (저장 스레드가 일괄 저장)"""
         try:
-            import json
-            
-            # 데이터 직렬화
-            fsr_json = json.dumps(fsr_data)
-            imu_json = json.dumps(imu_data) if imu_data else None
-            features_json = json.dumps(features.tolist())
-            details_json = json.dumps(prediction_details, default=str)
-            models_used = list(self.models.keys())
-            models_json = json.dumps(models_used)
-            
             # 개별 모델 결과 추출
             individual_preds = prediction_details.get('individual_predictions', {})
             individual_confs = prediction_details.get('individual_confidences', {})
-            voting_scores = prediction_details.get('voting_scores', [])
-            voting_json = json.dumps(voting_scores) if voting_scores else None
+            voting_scores = prediction_details.get('voting_scores')
             
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO prediction_logs (
-                        client_id, device_id, fsr_data, imu_data, raw_fsr_values, preprocessed_data,
-                        lr_prediction, lr_confidence, rf_prediction, rf_confidence,
-                        dt_prediction, dt_confidence, kn_prediction, kn_confidence,
-                        ensemble_prediction, ensemble_confidence, voting_scores,
-                        models_used, prediction_method, processing_time_ms
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    client_id, device_id, fsr_json, imu_json, fsr_json, features_json,
-                    individual_preds.get('lr'), individual_confs.get('lr'),
-                    individual_preds.get('rf'), individual_confs.get('rf'),
-                    individual_preds.get('dt'), individual_confs.get('dt'),
-                    individual_preds.get('kn'), individual_confs.get('kn'),
-                    final_prediction, final_confidence, voting_json,
-                    models_json, method, processing_time
-                ))
-                conn.commit()
-                
-                # DB 저장 성공 로그
-                from logger_config import log_db_save
-                log_db_save("prediction_logs", True)
+            # JSON 직렬화와 NumPy 값 변환은 저장 스레드에서 수행 (serialize_prediction_logs)
+            # features는 요청마다 재사용하는 버퍼이므로 대기열 전송 전에 값을 복사
+            row = (
+                time.time(), client_id, device_id, fsr_data, imu_data or None, fsr_data, features.copy(),
+                individual_preds.get('lr'), individual_confs.get('lr'),
+                individual_preds.get('rf'), individual_confs.get('rf'),
+                individual_preds.get('dt'), individual_confs.get('dt'),
+                individual_preds.get('kn'), individual_confs.get('kn'),
+                final_prediction, final_confidence, voting_scores,
+                self._models_json, method, processing_time
+            )
+            self._log_queue.put_nowait(row)
                 
         except Exception as e:
             logger.error(f"예측 로그 저장 오류: {e}")
-            from logger_config import log_db_save
             log_db_save("prediction_logs", False, str(e))
+    
+    def stop_prediction_log_writer(self):
+        """저장 스레드에 종료 신호를 보내고 남은 예측 로그가 저장될 때까지 대기"""
+        if not self._log_writer.is_alive():
+            return
+        try:
+            self._log_queue.put(None)
+            self._log_writer.join(PREDICTION_LOG_STOP_TIMEOUT)
+        except Exception as e:
+            logger.error(f"예측 로그 저장 스레드 종료 오류: {e}")
 
     def get_prediction_statistics(self, hours: int = 24) -> Dict:
-        """최근 예측 통계 조회"""
+        """최근 예측 통계 조회 (원본 로그 대신 시간대별 집계 테이블에서 계산)"""
         try:
+            # 집계 단위가 1시간이므로 시작 시각이 속한 시간대부터 포함
+            since = (int(time.time()) - hours * 3600) // 3600 * 3600
             with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # 최근 예측 통계
-                cursor.execute('''
-                    SELECT 
-                        prediction_method,
-                        COUNT(*) as count,
-                        AVG(ensemble_confidence) as avg_confidence,
-                        AVG(processing_time_ms) as avg_processing_time
-                    FROM prediction_logs 
-                    WHERE timestamp >= datetime('now', '-{} hours')
-                    GROUP BY prediction_method
-                '''.format(hours))
-                
-                stats = {}
-                for row in cursor.fetchall():
-                    method, count, avg_conf, avg_time = row
-                    stats[method] = {
-                        'predictions_count': count,
-                        'average_confidence': round(avg_conf or 0, 3),
-                        'average_processing_time_ms': round(avg_time or 0, 2)
-                    }
-                
-                # 모델별 정확도 (개별 모델 결과)
-                cursor.execute('''
-                    SELECT 
-                        COUNT(CASE WHEN lr_prediction = ensemble_prediction THEN 1 END) * 100.0 / COUNT(*) as lr_agreement,
-                        COUNT(CASE WHEN rf_prediction = ensemble_prediction THEN 1 END) * 100.0 / COUNT(*) as rf_agreement,
-                        COUNT(CASE WHEN dt_prediction = ensemble_prediction THEN 1 END) * 100.0 / COUNT(*) as dt_agreement,
-                        COUNT(CASE WHEN kn_prediction = ensemble_prediction THEN 1 END) * 100.0 / COUNT(*) as kn_agreement
-                    FROM prediction_logs 
-                    WHERE timestamp >= datetime('now', '-{} hours')
-                    AND prediction_method = 'ensemble'
-                '''.format(hours))
-                
-                agreement_row = cursor.fetchone()
-                if agreement_row:
-                    stats['model_agreement'] = {
-                        'lr_agreement_pct': round(agreement_row[0] or 0, 1),
-                        'rf_agreement_pct': round(agreement_row[1] or 0, 1),
-                        'dt_agreement_pct': round(agreement_row[2] or 0, 1),
-                        'kn_agreement_pct': round(agreement_row[3] or 0, 1)
-                    }
-                
-                return stats
+                rows = conn.execute(SELECT_PREDICTION_STATS_HOURLY_SQL, (since,)).fetchall()
+            
+            stats = {}
+            agreement_row = None
+            for method, count, sum_conf, sum_time, *agree in rows:
+                stats[method] = {
+                    'predictions_count': count,
+                    'average_confidence': round(sum_conf / count, 3),
+                    'average_processing_time_ms': round(sum_time / count, 2)
+                }
+                if method == 'ensemble_stage1':
+                    agreement_row = [value * 100.0 / count for value in agree]
+            
+            # 모델별 정확도 (개별 모델 결과)
+            agreement_row = agreement_row or [0, 0, 0, 0]
+            stats['model_agreement'] = {
+                'lr_agreement_pct': round(agreement_row[0], 1),
+                'rf_agreement_pct': round(agreement_row[1], 1),
+                'dt_agreement_pct': round(agreement_row[2], 1),
+                'kn_agreement_pct': round(agreement_row[3], 1)
+            }
+            
+            return stats
                 
         except Exception as e:
             logger.error(f"예측 통계 조회 오류: {e}")
@@ -747,14 +1476,18 @@ class EnsemblePosturePredictor:
             if len(fsr_data) == 0:
                 return False
             
-            # 모든 값이 숫자인지 확인
-            for value in fsr_data:
-                if not isinstance(value, (int, float)):
-                    return False
-                
-                # 음수 값 확인 (압력 센서는 일반적으로 음수가 아님)
-                if value < 0:
-                    logger.warning(f"음수 FSR 값 감지: {value}")
+            # 모든 값이 숫자인지 C 수준에서 한 번에 확인 (문자열/None/중첩 리스트는 TypeError)
+            # 11개 정도의 짧은 리스트는 NumPy 배열 생성보다 array.array 변환이 빠름
+            try:
+                values = array.array('d', fsr_data)
+            except TypeError:
+                return False
+            if any(map(math.isnan, values)):
+                return False
+            
+            # 음수 값 확인 (압력 센서는 일반적으로 음수가 아님)
+            if min(values) < 0:
+                logger.warning(f"음수 FSR 값 감지: {[value for value in values if value < 0]}")
             
             return True
             
@@ -765,5 +1498,21 @@ class EnsemblePosturePredictor:
 # PosturePredictor 클래스는 이제 EnsemblePosturePredictor로 대체됨
 PosturePredictor = EnsemblePosturePredictor
 
-# 전역 예측기 인스턴스
-predictor = EnsemblePosturePredictor()
\ No newline at end of file
+# 전역 예측기 인스턴스: 임포트 시점이 아니라 처음 필요할 때 생성 (모델 로드, 테이블 생성, 저장 스레드 시작)
+_predictor_instance = None
+_predictor_lock = threading.Lock()
+
+def get_predictor() -> EnsemblePosturePredictor:
+    """전역 예측기 반환 (첫 호출 시 생성, 여러 스레드에서 동시에 호출해도 한 번만 생성)"""
+    global _predictor_instance
+    if _predictor_instance is None:
+        with _predictor_lock:
+            if _predictor_instance is None:
+                _predictor_instance = EnsemblePosturePredictor()
+    return _predictor_instance
+
+def __getattr__(name):
+    """기존 코드의 `from model_predictor import predictor` 호환 (접근 시 get_predictor() 호출)"""
+    if name == 'predictor':
+        return get_predictor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
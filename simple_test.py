@@ -7,6 +7,18 @@ import websockets
 import json
 import logging
 
+# orjson이 설치되어 있으면 메시지 직렬화/파싱에 사용 (서버가 텍스트 프레임을 기대하므로 str로 변환해 전송)
+try:
+    import orjson
+    
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+    
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
 # 로거 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -33,12 +45,12 @@ async def test_server():
             }
             
             # 메시지 전송
-            await websocket.send(json.dumps(test_message))
+            await websocket.send(_dumps(test_message))
             logger.info(f"테스트 데이터 전송: {test_message}")
             
             # 응답 대기
             response = await asyncio.wait_for(websocket.recv(), timeout=10.0)
-            response_data = json.loads(response)
+            response_data = _loads(response)
             
             logger.info(f"서버 응답 수신:")
             logger.info(f"  - 메시지 ID: {response_data.get('id')}")
@@ -57,22 +69,27 @@ async def test_server():
                 {"name": "앞쪽 치우침", "fsr": [800, 700, 600, 200, 100, 800, 700, 300, 200, 100, 50]}
             ]
             
+            # 메시지를 한 번에 모두 보낸 뒤 응답을 모아서 받음 (요청마다 왕복 시간을 기다리지 않음)
+            pattern_names = {}
+            messages = []
             for i, pattern in enumerate(test_patterns, 2):
-                test_msg = {
+                pattern_names[i] = pattern["name"]
+                messages.append(_dumps({
                     "id": i,
                     "device_id": "test_device_001",
                     "FSR": pattern["fsr"]
-                }
-                
-                await websocket.send(json.dumps(test_msg))
-                logger.info(f"추가 테스트 전송 - {pattern['name']}")
-                
+                }))
+            
+            for message in messages:
+                await websocket.send(message)
+            logger.info(f"추가 테스트 {len(messages)}건 전송")
+            
+            for _ in messages:
                 response = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                response_data = json.loads(response)
-                
-                logger.info(f"  응답: 자세 {response_data.get('posture')}, 신뢰도 {response_data.get('confidence')}")
+                response_data = _loads(response)
+                name = pattern_names.get(response_data.get('id'), response_data.get('id'))
                 
-                await asyncio.sleep(1)
+                logger.info(f"  {name} 응답: 자세 {response_data.get('posture')}, 신뢰도 {response_data.get('confidence')}")
             
             logger.info("🎉 모든 테스트 완료!")
                 
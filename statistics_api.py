@@ -4,6 +4,7 @@
 """
 
 import sqlite3
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from pydantic import BaseModel
@@ -13,7 +14,10 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 import time
 import struct
+import json
 from config import config
+from logger_config import log_api_request
+from database import get_thread_connection
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -90,21 +94,20 @@ app = FastAPI(
 # API 요청 로깅 미들웨어
 @app.middleware("http")
 async def logging_middleware(request: Request, call_next):
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
     # 요청 정보 로깅
     method = request.method
     path = request.url.path
     client_ip = request.client.host if request.client else "unknown"
     
-    from logger_config import log_api_request
     log_api_request(path, method, client_ip)
     
     # 응답 처리
     response = await call_next(request)
-    process_time = time.time() - start_time
+    process_time_ms = (time.perf_counter_ns() - start_time) / 1e6
     
-    logger.info(f"API 응답: {method} {path} - {response.status_code} ({process_time*1000:.1f}ms)")
+    logger.info(f"API 응답: {method} {path} - {response.status_code} ({process_time_ms:.1f}ms)")
     
     return response
 
@@ -188,16 +191,18 @@ class StatisticsDatabase:
     
     def __init__(self, db_path=None):
         self.db_path = db_path or config.DATABASE_PATH
+        self._local = threading.local()
     
     def get_db_connection(self):
-        """데이터베이스 연결 반환"""
-        return sqlite3.connect(self.db_path)
+        """데이터베이스 연결 반환 (스레드별 연결 재사용, 행은 sqlite3.Row로 이름/인덱스 접근 가능)"""
+        return get_thread_connection(self._local, self.db_path, row_factory=sqlite3.Row)
+    
+    get_connection = get_db_connection
     
     def calculate_posture_durations(self, start_date: str = None, end_date: str = None, device_id: str = None) -> List[Dict]:
         """자세별 지속 시간 계산"""
         try:
             with self.get_db_connection() as conn:
-                conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
                 # 기본 쿼리
@@ -775,6 +780,7 @@ async def get_posture_labels():
 
 @app.get("/statistics/prediction", tags=["Statistics"])
 async def get_prediction_statistics(
+    request: Request,
     hours: int = Query(24, description="통계 조회 기간 (시간)", ge=1, le=168)
 ):
     """
@@ -785,7 +791,11 @@ async def get_prediction_statistics(
     예측 방법별 통계, 모델별 성능, 처리 시간 등을 제공합니다.
     """
     try:
-        from model_predictor import predictor
+        # 서버 실행 시 등록된 API 스레드 전용 예측기 사용 (단독 실행 시 전역 예측기)
+        predictor = getattr(request.app.state, 'predictor', None)
+        if predictor is None:
+            from model_predictor import get_predictor
+            predictor = get_predictor()
         
         stats = predictor.get_prediction_statistics(hours)
         
@@ -826,14 +836,13 @@ async def get_recent_prediction_logs(
                     kn_prediction, kn_confidence,
                     voting_scores, models_used
                 FROM prediction_logs 
-                WHERE timestamp >= datetime('now', '-{} hours')
-                ORDER BY timestamp DESC 
+                WHERE timestamp >= datetime('now', ?)
+                ORDER BY timestamp DESC
                 LIMIT ?
-            '''.format(hours), (limit,))
+            ''', (f'-{hours} hours', limit))
             
             logs = []
             for row in cursor.fetchall():
-                import json
                 log_entry = {
                     'timestamp': safe_str_convert(row[0]),
                     'client_id': safe_str_convert(row[1]),
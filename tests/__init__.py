@@ -0,0 +1,16 @@
+"""
+서버 모듈 테스트 (python -m unittest discover tests)
+
+config는 임포트 시점에 환경 변수를 읽으므로, 각 테스트 모듈은 서버 모듈보다 먼저 이 패키지를 임포트해
+임시 DB 경로를 지정합니다. 셸에 DATABASE_PATH가 설정되어 있어도 저장소/운영 DB에 쓰지 않도록 항상 덮어쓰고,
+임시 디렉터리는 종료 시 삭제합니다.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+TEST_DIR = tempfile.mkdtemp(prefix='posture_test_')
+os.environ['DATABASE_PATH'] = os.path.join(TEST_DIR, 'test.db')
+atexit.register(shutil.rmtree, TEST_DIR, ignore_errors=True)
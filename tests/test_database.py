@@ -0,0 +1,67 @@
+"""센서 데이터 저장 형식 테스트: 현재 BLOB/JSON 형식과 기존 str() 텍스트 행 복원"""
+
+import asyncio
+import os
+import sqlite3
+import unittest
+from unittest import mock
+
+from tests import TEST_DIR  # 서버 모듈보다 먼저 임시 DB 경로 지정
+import database
+from database import PostureDatabase, decode_sensor_data, encode_sensor_data
+
+
+class SensorDataEncodingTest(unittest.TestCase):
+    def test_round_trip(self):
+        fsr = [489.0, 625.0, 581.5]
+        self.assertEqual(decode_sensor_data(encode_sensor_data(fsr)), fsr)
+        imu = {'relativePitch': 3.0}
+        self.assertEqual(decode_sensor_data(encode_sensor_data(imu)), imu)
+        self.assertIsNone(decode_sensor_data(encode_sensor_data(None)))
+
+    def test_legacy_text_rows(self):
+        self.assertEqual(decode_sensor_data(str([489, 625, 581])), [489, 625, 581])
+        self.assertEqual(decode_sensor_data(str({'relativePitch': 3.0})), {'relativePitch': 3.0})
+        self.assertIsNone(decode_sensor_data(str(None)))
+
+
+class PredictionFlushTest(unittest.TestCase):
+    def setUp(self):
+        self.db = PostureDatabase(os.path.join(TEST_DIR, f'flush_{self._testMethodName}.db'))
+        self.addCleanup(self.db.close)
+
+    def count_rows(self):
+        with sqlite3.connect(self.db.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM posture_predictions").fetchone()[0]
+
+    def test_periodic_flush_saves_without_new_predictions(self):
+        async def scenario():
+            await self.db.save_prediction('c', 'd', 1, 0.9, None, [1.0, 2.0])
+            task = asyncio.create_task(self.db.run_periodic_flush(interval=0.01))
+            await asyncio.sleep(0.2)
+            task.cancel()
+
+        asyncio.run(scenario())
+        self.assertEqual(self.count_rows(), 1)
+
+    def test_failed_write_is_requeued(self):
+        async def scenario():
+            await self.db.save_prediction('c', 'd', 1, 0.9, None, [1.0, 2.0])
+            with mock.patch.object(self.db, 'write_many', side_effect=sqlite3.OperationalError('locked')):
+                await self.db._flush_pending_predictions()
+            self.assertEqual(len(self.db._pending_predictions), 1)
+            await self.db._flush_pending_predictions()
+
+        asyncio.run(scenario())
+        self.assertEqual(self.count_rows(), 1)
+        self.assertEqual(self.db._pending_predictions, [])
+
+    def test_requeue_is_bounded(self):
+        with mock.patch.object(database, 'PREDICTION_PENDING_MAX', 3):
+            self.db._requeue_predictions([(str(i),) for i in range(5)])
+        self.assertEqual(self.db._pending_predictions, [('2',), ('3',), ('4',)])
+        self.db._pending_predictions.clear()  # 형식이 맞지 않는 행이 close()에서 저장되지 않도록 비움
+
+
+if __name__ == '__main__':
+    unittest.main()
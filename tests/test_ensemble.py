@@ -0,0 +1,51 @@
+"""통합 앙상블 ONNX 그래프 테스트: 그래프 한 번 실행 결과가 모델별 예측과 같은지 확인"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+import tests  # noqa: F401 - 서버 모듈보다 먼저 임시 DB 경로 지정
+from model_predictor import FEATURE_DTYPE, ML_DIR, EnsemblePosturePredictor, ort
+
+try:
+    sys.path.insert(0, ML_DIR)
+    from onnx_export import export_ensemble
+except ImportError:  # skl2onnx가 없으면 그래프를 만들 수 없음
+    export_ensemble = None
+
+
+@unittest.skipIf(ort is None or export_ensemble is None, "onnxruntime/skl2onnx가 설치되어 있지 않음")
+class MergedEnsembleTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.predictor = EnsemblePosturePredictor()
+        cls.features = np.random.default_rng(0).uniform(0, 1023, (200, 11)).astype(FEATURE_DTYPE)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.predictor.stop_prediction_log_writer()
+
+    def test_merged_graph_matches_per_model_vote(self):
+        predictor = self.predictor
+        if len(predictor._ordered_models) < 2:
+            self.skipTest("앙상블 모델(ML/model_*.joblib)이 없음")
+        expected = predictor.ensemble_predict_batch(self.features, collect_details=True)
+
+        with tempfile.TemporaryDirectory() as ml_dir:
+            export_ensemble(os.path.join(ml_dir, 'model_ensemble.onnx'))
+            predictor.load_onnx_sessions(ml_dir)
+        self.addCleanup(predictor.load_onnx_sessions, ML_DIR)
+        self.assertIsNotNone(predictor._ensemble_session)
+
+        merged = predictor.ensemble_predict_batch(self.features, collect_details=True)
+        for (pred, conf, details), (expected_pred, expected_conf, expected_details) in zip(merged, expected):
+            self.assertEqual(pred, expected_pred)
+            self.assertAlmostEqual(conf, expected_conf, places=5)
+            self.assertEqual(details['individual_predictions'], expected_details['individual_predictions'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""예측 로그 저장 경로 테스트: log_prediction -> 저장 스레드 -> prediction_logs"""
+
+import json
+import sqlite3
+import unittest
+
+import numpy as np
+
+import tests  # noqa: F401 - 서버 모듈보다 먼저 임시 DB 경로 지정
+from config import config
+from model_predictor import (
+    EnsemblePosturePredictor, pack_prediction_logs, unpack_prediction_logs, update_prediction_stats_hourly
+)
+
+FSR_SAMPLES = [
+    [489, 625, 581, 483, 375, 517, 571, 530, 372, 398, 248],
+    [200, 300, 400, 500, 600, 100, 150, 200, 100, 150, 100],
+    [600, 500, 400, 300, 200, 400, 350, 300, 250, 200, 150],
+]
+
+
+class PredictionLogRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self._save_predictions = config.SAVE_PREDICTIONS
+        config.SAVE_PREDICTIONS = True
+        self.predictor = EnsemblePosturePredictor()
+        self.addCleanup(self.predictor.stop_prediction_log_writer)
+        with sqlite3.connect(self.predictor.db_manager.db_path) as conn:
+            self.start_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM prediction_logs").fetchone()[0]
+
+    def tearDown(self):
+        config.SAVE_PREDICTIONS = self._save_predictions
+
+    def test_logged_predictions_are_written(self):
+        results = [
+            self.predictor.predict_posture(fsr, {'relativePitch': 3.0}, client_id='test_client', device_id='test_device')
+            for fsr in FSR_SAMPLES
+        ]
+        self.predictor.stop_prediction_log_writer()  # 남은 행을 저장할 때까지 대기
+
+        with sqlite3.connect(self.predictor.db_manager.db_path) as conn:
+            rows = conn.execute(
+                "SELECT client_id, device_id, fsr_data, imu_data, ensemble_prediction, models_used "
+                "FROM prediction_logs WHERE id > ? ORDER BY id", (self.start_id,)).fetchall()
+
+        self.assertEqual(len(rows), len(FSR_SAMPLES))
+        for (client_id, device_id, fsr_json, imu_json, ensemble_prediction, models_json), fsr, result in zip(
+                rows, FSR_SAMPLES, results):
+            self.assertEqual((client_id, device_id), ('test_client', 'test_device'))
+            self.assertEqual(json.loads(fsr_json), fsr)
+            self.assertEqual(json.loads(imu_json), {'relativePitch': 3.0})
+            self.assertEqual(json.loads(models_json), list(self.predictor.models))
+            self.assertIsInstance(ensemble_prediction, int)
+            self.assertEqual(ensemble_prediction, result[0])
+
+        stats = self.predictor.get_prediction_statistics(hours=1)
+        self.assertGreaterEqual(stats['ensemble_stage1']['predictions_count'], len(FSR_SAMPLES))
+        self.assertGreater(sum(stats['model_agreement'].values()), 0)
+
+    def test_hourly_stats_use_record_timestamp(self):
+        # 정시를 걸친 배치: 각 레코드는 자신의 예측 시각이 속한 시간대에 집계되어야 함
+        hour = 3600 * 100
+        records = [
+            (hour - 1.0, 'c', 'd', None, None, None, None, 1, 0.9, 1, 0.9, 2, 0.8, 1, 0.7,
+             1, 0.9, None, '[]', 'test_method', 2.0),
+            (hour + 1.0, 'c', 'd', None, None, None, None, 1, 0.9, 1, 0.9, 1, 0.8, 1, 0.7,
+             1, 0.5, None, '[]', 'test_method', 4.0),
+        ]
+        with sqlite3.connect(self.predictor.db_manager.db_path) as conn:
+            update_prediction_stats_hourly(conn, records)
+            rows = conn.execute(
+                "SELECT hour_bucket, n, sum_conf, sum_time, dt_agree FROM prediction_stats_hourly "
+                "WHERE prediction_method = 'test_method' ORDER BY hour_bucket").fetchall()
+            conn.execute("DELETE FROM prediction_stats_hourly WHERE prediction_method = 'test_method'")
+
+        self.assertEqual(rows, [(hour - 3600, 1, 0.9, 2.0, 0), (hour, 1, 0.5, 4.0, 1)])
+
+
+class PackPredictionLogsTest(unittest.TestCase):
+    def test_numpy_values_are_packed(self):
+        fsr = [489, 625, 581]
+        record = (1700000000.5, 'test_client', 'test_device', fsr, None, fsr,
+                  np.arange(3, dtype=np.float32), np.int64(2), np.float32(0.5)) + (None,) * 12
+        rows = pack_prediction_logs([record, record])
+
+        self.assertEqual(len(rows), 1)
+        client_id, device_id, first_ts, last_ts, count, payload = rows[0]
+        self.assertEqual((client_id, device_id, first_ts, last_ts, count),
+                         ('test_client', 'test_device', 1700000000.5, 1700000000.5, 2))
+        unpacked = unpack_prediction_logs(payload)
+        self.assertEqual(unpacked[0]['fsr_data'], fsr)
+        self.assertEqual(json.loads(unpacked[0]['preprocessed_data']), [0.0, 1.0, 2.0])
+        self.assertEqual((unpacked[0]['lr_prediction'], unpacked[0]['lr_confidence']), (2, 0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
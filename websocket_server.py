@@ -1,28 +1,58 @@
 import asyncio
 import websockets
 import json
+import struct
 import uuid
 import time
 from typing import Dict, Set
 import logging
 from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
 
-from model_predictor import predictor
+from model_predictor import get_predictor
 from database import db
 from config import config
 from logger_config import (
     setup_logging, log_server_start, log_server_shutdown,
-    log_client_data, log_prediction_result, log_error, log_performance_metrics
+    log_client_data, log_prediction_result, log_error, log_performance_metrics,
+    log_websocket_connection
 )
 
 # 로깅 설정
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# 메시지 JSON 파싱/직렬화: orjson이 설치되어 있으면 사용 (응답은 기존과 같이 텍스트 프레임으로 전송)
+try:
+    import orjson
+    
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+    
+    _loads = orjson.loads
+except ImportError:  # orjson이 없으면 표준 json 사용
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False)
+    
+    _loads = json.loads
+
+# 바이너리 예측 응답 프레임: 자세 ID(uint8) + 신뢰도(float32), little-endian 5바이트
+PREDICTION_ACK = struct.Struct('<Bf')
+
+def wants_binary_ack(websocket, path=None):
+    """연결 경로의 쿼리(?format=binary)로 바이너리 응답 사용 여부 판단"""
+    if path is None:
+        request = getattr(websocket, 'request', None)
+        path = getattr(request, 'path', None) or getattr(websocket, 'path', '') or ''
+    query = parse_qs(urlsplit(path).query)
+    return query.get('format', ['json'])[0] == 'binary'
+
 class PostureWebSocketServer:
     def __init__(self, host=None, port=None):
         self.host = host or config.SERVER_HOST
         self.port = port or config.WEBSOCKET_PORT
+        # 서버 생성 시 모델 로드 (PRELOAD_MODELS=false면 첫 예측 요청 때 로드)
+        self.predictor = get_predictor() if config.PRELOAD_MODELS else None
         self.connected_clients: Dict[str, websockets.WebSocketServerProtocol] = {}
         self.client_info: Dict[str, Dict] = {}
         self.performance_stats = {
@@ -31,7 +61,7 @@ class PostureWebSocketServer:
             'response_times': []
         }
     
-    async def register_client(self, websocket):
+    async def register_client(self, websocket, binary_ack=False):
         """새 클라이언트 등록"""
         client_id = str(uuid.uuid4())
         self.connected_clients[client_id] = websocket
@@ -40,14 +70,14 @@ class PostureWebSocketServer:
         self.client_info[client_id] = {
             'connect_time': datetime.now(),
             'predictions_count': 0,
-            'last_activity': datetime.now()
+            'last_activity': time.time(),  # 메시지마다 갱신하므로 datetime 대신 epoch 초
+            'binary_ack': binary_ack
         }
         
         # 데이터베이스에 연결 기록
         await db.log_client_connection(client_id)
         
         # 상세 연결 로그
-        from logger_config import log_websocket_connection
         log_websocket_connection(client_id, "connected")
         logger.info(f"새 클라이언트 연결: {client_id} (총 {len(self.connected_clients)}명 연결)")
         
@@ -65,13 +95,12 @@ class PostureWebSocketServer:
         await db.log_client_disconnection(client_id)
         
         # 상세 연결 해제 로그
-        from logger_config import log_websocket_connection
         log_websocket_connection(client_id, "disconnected")
         logger.info(f"클라이언트 연결 해제: {client_id} (총 {len(self.connected_clients)}명 연결)")
     
     async def process_sensor_data(self, client_id, data):
         """센서 데이터 처리 및 자세 예측"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         try:
             # 입력 데이터 검증
@@ -86,26 +115,36 @@ class PostureWebSocketServer:
             imu_data = data.get('IMU')  # IMU 데이터는 받되 예측에는 사용 안함
             fsr_data = data['FSR']
             
+            if self.predictor is None:
+                # 모델 로드(수 초)가 이벤트 루프를 막지 않도록 워커 스레드에서 전역 예측기 생성
+                self.predictor = await asyncio.to_thread(get_predictor)
+            
             # FSR 데이터 유효성 검사
-            if not predictor.validate_model_input(fsr_data):
+            if not self.predictor.validate_model_input(fsr_data):
                 raise ValueError("유효하지 않은 FSR 데이터")
             
-            log_client_data(client_id, "sensor", len(json.dumps(data)))
+            # 크기 계산용 직렬화는 DEBUG 로그가 켜진 경우에만 수행
+            if logger.isEnabledFor(logging.DEBUG):
+                log_client_data(client_id, "sensor", len(_dumps(data)))
             
             # 자세 예측 수행 (클라이언트 정보 포함) - IMU는 예측에 사용하지 않음
-            predicted_posture, confidence = predictor.predict_posture(
+            predicted_posture, confidence = await self.predictor.predict_posture_async(
                 fsr_data, imu_data, client_id=client_id, device_id=device_id
             )
             
             # 처리 시간 계산
-            processing_time_ms = (time.time() - start_time) * 1000
+            processing_time_ms = (time.perf_counter_ns() - start_time) / 1e6
             
             # 응답 데이터 생성 (NumPy 타입을 Python 기본 타입으로 변환)
-            response_data = {
-                "id": message_id,
-                "posture": int(predicted_posture),  # numpy.int64 -> int 변환
-                "confidence": float(round(confidence, 3))  # numpy.float64 -> float 변환
-            }
+            if self.client_info[client_id]['binary_ack']:
+                # 바이너리 응답은 요청 순서대로 전송되므로 메시지 ID를 생략
+                response_data = PREDICTION_ACK.pack(int(predicted_posture), float(confidence))
+            else:
+                response_data = {
+                    "id": message_id,
+                    "posture": int(predicted_posture),  # numpy.int64 -> int 변환
+                    "confidence": float(round(confidence, 3))  # numpy.float64 -> float 변환
+                }
             
             # 클라이언트에게 결과 전송
             await self.send_to_client(client_id, response_data)
@@ -123,7 +162,7 @@ class PostureWebSocketServer:
             # 통계 업데이트
             self.update_performance_stats(processing_time_ms)
             self.client_info[client_id]['predictions_count'] += 1
-            self.client_info[client_id]['last_activity'] = datetime.now()
+            self.client_info[client_id]['last_activity'] = time.time()
             
             log_prediction_result(client_id, predicted_posture, confidence, processing_time_ms)
             
@@ -146,7 +185,10 @@ class PostureWebSocketServer:
         
         try:
             websocket = self.connected_clients[client_id]
-            message = json.dumps(data, ensure_ascii=False)
+            if isinstance(data, bytes):
+                message = data  # 바이너리 프레임은 그대로 전송
+            else:
+                message = _dumps(data)
             await websocket.send(message)
             
             logger.debug(f"클라이언트 {client_id}에게 데이터 전송 완료")
@@ -162,13 +204,13 @@ class PostureWebSocketServer:
     
     async def handle_client(self, websocket, path=None):
         """클라이언트 연결 처리"""
-        client_id = await self.register_client(websocket)
+        client_id = await self.register_client(websocket, wants_binary_ack(websocket, path))
         
         try:
             async for message in websocket:
                 try:
                     # JSON 파싱
-                    data = json.loads(message)
+                    data = _loads(message)  # orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스
                     
                     # 센서 데이터 처리
                     await self.process_sensor_data(client_id, data)
@@ -247,6 +289,8 @@ class PostureWebSocketServer:
             
             # 통계 로깅 태스크 시작
             stats_task = asyncio.create_task(self.log_periodic_stats())
+            # 예측 결과 주기 저장 태스크 시작 (요청이 끊겨도 대기 중인 결과를 저장)
+            flush_task = asyncio.create_task(db.run_periodic_flush())
             
             # WebSocket 서버 시작
             server = await websockets.serve(